@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import MISSING_VALUES, SCORE_COLUMNS, unique_recordings
+
+# Dimensions of the KPI cube; every KPI on the Overview is a roll-up over them
+CUBE_DIMENSIONS = ["Folder", "Date", "Course Interested", "Lead City"]
+
+
+# Pre-aggregate the recordings into one row per Folder x Date x Course Interested x Lead City
+# holding the number of recordings and, per score, its count, sum and sum of squares.
+# Cubes are additive, so new recordings are folded in with merge_kpi_cubes.
+def build_kpi_cube(df):
+    columns = ["Recordings"] + [
+        f"{col}_{measure}" for col in SCORE_COLUMNS for measure in ("count", "sum", "sumsq")
+    ]
+    if df.empty:
+        return pd.DataFrame(columns=columns, dtype="float64")
+
+    measures = pd.DataFrame({"Recordings": 1.0}, index=df.index)
+    for col in SCORE_COLUMNS:
+        scores = df[col].astype("float64") if col in df.columns else pd.Series(float("nan"), index=df.index)
+        measures[f"{col}_count"] = scores.notna().astype("float64")
+        measures[f"{col}_sum"] = scores.fillna(0)
+        measures[f"{col}_sumsq"] = scores.fillna(0) ** 2
+
+    keys = [
+        df[dim] if dim in df.columns else pd.Series(None, index=df.index, name=dim, dtype="object")
+        for dim in CUBE_DIMENSIONS
+    ]
+    return measures.groupby(keys, dropna=False, observed=True).sum()[columns]
+
+
+# Add (sign=1) or remove (sign=-1) the recordings summarized by delta; empty groups are dropped
+def merge_kpi_cubes(cube, delta, sign=1):
+    if delta.empty:
+        return cube
+    if cube.empty:
+        return delta * sign
+    merged = cube.add(delta * sign, fill_value=0)
+    return merged[merged["Recordings"] > 0]
+
+
+# Cube rows for calls dated within date_range (start and end dates inclusive)
+def filter_kpi_cube(cube, date_range):
+    if date_range is None or cube.empty:
+        return cube
+    start, end = date_range
+    dates = cube.index.get_level_values("Date")
+    return cube[(dates >= pd.Timestamp(start)) & (dates < pd.Timestamp(end) + pd.Timedelta(days=1))]
+
+
+# Count, mean and standard deviation of every score across the whole cube
+def summarize_kpi_cube(cube):
+    totals = cube.sum()
+    summary = pd.DataFrame(index=SCORE_COLUMNS)
+    summary["count"] = [totals.get(f"{col}_count", 0.0) for col in SCORE_COLUMNS]
+    sums = pd.Series([totals.get(f"{col}_sum", 0.0) for col in SCORE_COLUMNS], index=SCORE_COLUMNS)
+    sumsqs = pd.Series([totals.get(f"{col}_sumsq", 0.0) for col in SCORE_COLUMNS], index=SCORE_COLUMNS)
+    counts = summary["count"].where(summary["count"] > 0)
+    summary["mean"] = sums / counts
+    summary["std"] = (sumsqs / counts - summary["mean"] ** 2).clip(lower=0) ** 0.5
+    return summary
+
+
+# Mean of every score that has at least one value
+def cube_score_means(cube):
+    return summarize_kpi_cube(cube)["mean"].dropna()
+
+
+# Mean of every score per course, for the top_n courses with the most recordings.
+# Rows without a course ("N/A", "NA" or missing) are left out.
+def course_score_means(cube, top_n):
+    if cube.empty:
+        return pd.DataFrame(columns=SCORE_COLUMNS, dtype="float64")
+    by_course = cube.groupby(level="Course Interested", observed=True).sum()
+    by_course = by_course[~by_course.index.isin(MISSING_VALUES)]
+    by_course = by_course.nlargest(top_n, "Recordings")
+    return pd.DataFrame(
+        {
+            col: by_course[f"{col}_sum"] / by_course[f"{col}_count"].where(by_course[f"{col}_count"] > 0)
+            for col in SCORE_COLUMNS
+        }
+    )
+
+
+# Given quantile of every score per course, for the listed courses only
+def build_course_score_quantiles(df, courses, q):
+    rows = df[df["Course Interested"].isin(courses)]
+    scores = rows[SCORE_COLUMNS].astype("float64")
+    return scores.groupby(rows["Course Interested"], observed=True).quantile(q)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def course_score_quantiles(version, _df, courses, q):
+    return build_course_score_quantiles(unique_recordings(_df), courses, q)
+
+
+# Number of recordings per whole score from 0 to 10, one column per score. Binning
+# happens here so each chart ships 11 bars instead of every raw score.
+def build_score_histograms(df):
+    counts = {}
+    for col in SCORE_COLUMNS:
+        values = df[col].dropna().to_numpy(dtype="int64") if col in df.columns else np.empty(0, dtype="int64")
+        counts[col] = np.bincount(values, minlength=11)
+    return pd.DataFrame(counts, index=pd.RangeIndex(11, name="Score"))
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def score_histograms(version, _df):
+    return build_score_histograms(unique_recordings(_df))
+
+
+# Row positions of every folder plus per-folder score means, so switching between people
+# takes the rows of one folder instead of scanning the whole Folder column. Positions are
+# kept rather than a Folder-sorted copy of the corpus to avoid holding the data twice.
+class FolderIndex:
+    def __init__(self, df):
+        self.df = df
+        if df.empty:
+            self.positions = {}
+            self.score_means = pd.DataFrame(columns=SCORE_COLUMNS, dtype="float64")
+        else:
+            folders = df["Folder"].groupby(df["Folder"], observed=True)
+            self.positions = folders.indices
+            self.score_means = df[SCORE_COLUMNS].astype("float64").groupby(df["Folder"], observed=True).mean()
+        self.folders = list(self.positions)
+
+    # Recordings of one folder
+    def rows(self, folder):
+        return self.df.take(self.positions.get(folder, []))
+
+
+# Folder index of a loaded corpus, built once per data version and shared by all sessions.
+# Duplicate copies are kept, so every folder lists all of its own recordings.
+@st.cache_resource(max_entries=4, show_spinner=False)
+def folder_index(version, _df):
+    return FolderIndex(_df)
+
+
+# Cube of a loaded corpus, built once per data version and shared by all sessions. Like
+# every corpus-wide KPI it counts each recording once, leaving out its duplicate copies.
+@st.cache_resource(max_entries=4, show_spinner=False)
+def shared_kpi_cube(version, _df):
+    return build_kpi_cube(unique_recordings(_df))
@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Load time, memory and dashboard-logic time at growing corpus sizes, on synthetic trees
+# from generate_recordings.py. Every (size, benchmark) pair runs in a fresh interpreter so
+# max RSS and warm caches of one run never leak into the next. Results go to a JSON file
+# that can be diffed against the output of another commit.
+#   python benchmarks/bench_ingest.py --sizes 1000 10000 --output bench_results.json
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS = ["serial", "parallel", "incremental", "snapshot", "sections"]
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def frame_mb(df):
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+# Runs inside the child interpreter; returns the measurements of one benchmark
+def run_benchmark(benchmark, data_path, work_path):
+    os.environ["DASHBOARD_CACHE_DIR"] = os.path.join(work_path, "cache")
+    sys.path.insert(0, REPO_DIR)
+    import aggregates
+    import data_loader
+    from data_grid import LONG_TEXT_COLUMNS
+
+    result = {}
+    if benchmark == "serial":
+        df, result["load_s"] = timed(lambda: data_loader.apply_schema(data_loader.fetch_data_from_nested_folders(data_path)))
+    elif benchmark == "parallel":
+        df, result["load_s"] = timed(lambda: data_loader.apply_schema(data_loader.fetch_data_parallel(data_path)))
+    elif benchmark == "incremental":
+        # Cold: nothing cached. Disk: the pickled cache of the cold run.
+        shutil.rmtree(os.environ["DASHBOARD_CACHE_DIR"], ignore_errors=True)
+        (df, _), result["cold_s"] = timed(data_loader.fetch_data_incremental, data_path)
+        _, result["disk_s"] = timed(data_loader.fetch_data_incremental, data_path)
+    elif benchmark == "snapshot":
+        snapshot_path = os.path.join(work_path, "snapshot")
+        _, result["write_s"] = timed(data_loader.write_snapshot, data_path, snapshot_path)
+        (df, _), result["load_s"] = timed(data_loader.fetch_data_from_snapshot, data_path, snapshot_path=snapshot_path)
+    elif benchmark == "sections":
+        df = data_loader.apply_schema(data_loader.fetch_data_parallel(data_path))
+        result.update(measure_sections(df, aggregates, LONG_TEXT_COLUMNS))
+
+    result["rows"] = len(df)
+    result["frame_mb"] = round(frame_mb(df), 2)
+    result["max_rss_mb"] = round(max_rss_mb(), 2)
+    return {key: round(value, 4) if key.endswith("_s") else value for key, value in result.items()}
+
+
+# The dashboard logic behind each section, without Streamlit: what one uncached run computes
+def measure_sections(df, aggregates, long_text_columns):
+    timings = {}
+    cube, timings["overview.kpi_cube_s"] = timed(aggregates.build_kpi_cube, df)
+    _, timings["overview.score_means_s"] = timed(aggregates.cube_score_means, cube)
+    _, timings["overview.histograms_s"] = timed(aggregates.build_score_histograms, df)
+    course_means, timings["overview.course_means_s"] = timed(aggregates.course_score_means, cube, 10)
+    _, timings["overview.course_quantiles_s"] = timed(
+        aggregates.build_course_score_quantiles, df, list(course_means.index), 0.75
+    )
+    _, timings["overview.city_counts_s"] = timed(lambda: df["Lead City"].value_counts())
+
+    index, timings["people.folder_index_s"] = timed(aggregates.FolderIndex, df)
+
+    # Open every folder and sort its first grid page, as switching people in the People section does
+    def browse_folders():
+        grid_columns = [col for col in df.columns if col not in long_text_columns + ["_id"]]
+        for folder in index.folders:
+            rows = index.rows(folder)
+            rows.sort_values("Filename").iloc[:25][grid_columns]
+            index.score_means.loc[folder]
+
+    _, seconds = timed(browse_folders)
+    timings["people.per_folder_ms"] = round(seconds * 1000 / max(1, len(index.folders)), 3)
+    return timings
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Generate the tree for a size once and reuse it across runs
+def ensure_tree(work_dir, size, per_folder, seed):
+    from generate_recordings import generate
+
+    data_path = os.path.join(work_dir, f"data_{size}")
+    done_marker = os.path.join(data_path, ".complete")
+    if not os.path.exists(done_marker):
+        shutil.rmtree(data_path, ignore_errors=True)
+        folders, remainder = divmod(size, per_folder)
+        generate(data_path, folders, per_folder, seed=seed)
+        if remainder:
+            generate(data_path, 1, remainder, seed=seed + 1)
+        open(done_marker, "w").close()
+    return data_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingestion and dashboard logic on synthetic data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument("--per-folder", type=int, default=100, help="recordings per generated folder")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "dashboard_bench"),
+                        help="where generated trees are kept between runs")
+    parser.add_argument("--decoder", default="auto", help="DASHBOARD_JSON_DECODER for the loaders")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--worker", nargs=3, metavar=("BENCHMARK", "DATA", "WORK"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_benchmark(*args.worker)))
+        return
+
+    results = []
+    for size in args.sizes:
+        start = time.perf_counter()
+        data_path = ensure_tree(args.work_dir, size, args.per_folder, args.seed)
+        print(f"{size} recordings ready in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        for benchmark in args.benchmarks:
+            with tempfile.TemporaryDirectory(dir=args.work_dir) as work_path:
+                child = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--worker", benchmark, data_path, work_path],
+                    capture_output=True,
+                    text=True,
+                    env=dict(os.environ, DASHBOARD_JSON_DECODER=args.decoder),
+                )
+            if child.returncode != 0:
+                print(child.stderr, file=sys.stderr)
+                results.append({"size": size, "benchmark": benchmark, "error": child.stderr.strip().splitlines()[-1]})
+                continue
+            result = {"size": size, "benchmark": benchmark, **json.loads(child.stdout.strip().splitlines()[-1])}
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+
+    import pandas
+
+    with open(args.output, "w") as file:
+        json.dump(
+            {
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "git_commit": git_commit(),
+                "python": platform.python_version(),
+                "pandas": pandas.__version__,
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "per_folder": args.per_folder,
+                "seed": args.seed,
+                "decoder": args.decoder,
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import argparse
+import json
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# Generate a synthetic data/<folder>/recording_<epoch_ms>.json tree shaped like the real
+# recordings: same fields, string scores, "NA"/"N/A" spellings, optional fields that are
+# sometimes absent and Summary/Feedback lengths in the range of the sample files.
+#   python benchmarks/generate_recordings.py --out /tmp/bench_data --folders 100 --per-folder 100
+
+COURSES = [
+    "Game and Esports",
+    "Gaming and Esports",
+    "AR and VR Technology",
+    "DevOps",
+    "Product Management",
+    "Data Science",
+    "Full Stack Development",
+    "UI UX Design",
+    "Digital Marketing",
+    "Cyber Security",
+]
+CITIES = ["Bengaluru", "Karnataka", "Mumbai", "Delhi", "Pune", "Hyderabad", "Chennai", "Kolkata", "Jaipur"]
+INTEREST_LEVELS = ["Interested", "UnInterested", "Uninterested", "Neutral"]
+EDUCATION = ["Graduation", "Graduate", "Post Graduate", "12th", "Diploma"]
+EXPERIENCE = ["3D artist", "15+ years", "11", "2 years", "Fresher", "5", "8 years"]
+OCCUPATIONS = ["Web Designer", "Student", "Software Engineer", "Teacher", "Accountant", "Sales Executive"]
+COMPANIES = ["MNC", "Startup", "Self-employed", "Government"]
+FOLLOW_UPS = ["Sunday, 10 a.m.", "Yes", "No", "Tomorrow evening", "Next week"]
+INQUIRY_FOR = ["Self", "Son", "Daughter", "Friend"]
+
+WORDS = (
+    "the LC had a conversation with lead who is interested in course and asked about fee "
+    "placement scholarship program duration batch timings mentor support EMI options "
+    "offered discount free Generative AI complimentary gift follow-up call scheduled "
+    "concerns addressed questions career switch portfolio projects certificate online "
+    "offline classes weekend demo session counsellor explained curriculum industry"
+).split()
+FEEDBACK_WORDS = (
+    "improve clarity concision communication handle objections fee effectively provide "
+    "clear solutions lead concerns build rapport ask probing questions listen actively"
+).split()
+
+NA_SPELLINGS = ["NA", "N/A"]
+OPTIONAL_FIELDS = ["Lead Occupation", "Date", "Summary", "Feedback for improvement"]
+
+
+def sentence(rng, words, mean, spread):
+    length = max(3, int(rng.gauss(mean, spread)))
+    text = " ".join(rng.choice(words) for _ in range(length))
+    return text[0].upper() + text[1:] + "."
+
+
+def make_recording(rng, timestamp_ms, na_rate, missing_rate, summary_words):
+    def label(values):
+        return rng.choice(NA_SPELLINGS) if rng.random() < na_rate else rng.choice(values)
+
+    def score():
+        return rng.choice(NA_SPELLINGS) if rng.random() < na_rate / 4 else str(rng.randint(2, 10))
+
+    # Calls are analysed some days after they were recorded, as in the sample data
+    call_date = datetime.fromtimestamp(timestamp_ms / 1000) + timedelta(days=rng.randint(0, 20))
+    record = {
+        "_id": {"$oid": f"{rng.getrandbits(96):024x}"},
+        "Filename": f"recording {timestamp_ms}.txt",
+        "BANT Score": score(),
+        "Call Intent Score": score(),
+        "Course Interested": label(COURSES),
+        "Detailed Call Score": score(),
+        "Feedback for improvement": sentence(rng, FEEDBACK_WORDS, 10, 3) if rng.random() > 0.1 else None,
+        "Follow Up": label(FOLLOW_UPS),
+        "Lead Busy": rng.choice(["Yes", "No"]),
+        "Lead City": label(CITIES),
+        "Lead Company": label(COMPANIES),
+        "Lead Ctc": label([str(ctc) for ctc in range(2, 30)]),
+        "Lead Education": label(EDUCATION),
+        "Lead Experience": label(EXPERIENCE),
+        "Lead Occupation": label(OCCUPATIONS),
+        "Lead inquiry for": label(INQUIRY_FOR),
+        "Lead interest level": label(INTEREST_LEVELS),
+        "SPIN Score": score(),
+        "Sentiment Analysis Score": score(),
+        "Date": call_date.strftime("%d-%m-%Y"),
+        "Summary": sentence(rng, WORDS, summary_words, summary_words / 4),
+    }
+    for field in OPTIONAL_FIELDS:
+        if rng.random() < missing_rate:
+            del record[field]
+    return record
+
+
+# Write folders x per_folder recordings under out; returns the number of files written
+def generate(
+    out, folders, per_folder, na_rate=0.2, missing_rate=0.1, summary_words=55, days=365, seed=0
+):
+    rng = random.Random(seed)
+    end_ms = int(time.time() * 1000)
+    start_ms = end_ms - days * 24 * 3600 * 1000
+    written = 0
+    for _ in range(folders):
+        folder_path = os.path.join(out, str(uuid.UUID(int=rng.getrandbits(128), version=1)))
+        os.makedirs(folder_path, exist_ok=True)
+        timestamps = set()
+        while len(timestamps) < per_folder:
+            timestamps.add(rng.randint(start_ms, end_ms))
+        for timestamp_ms in timestamps:
+            record = make_recording(rng, timestamp_ms, na_rate, missing_rate, summary_words)
+            with open(os.path.join(folder_path, f"recording_{timestamp_ms}.json"), "w") as file:
+                json.dump(record, file, indent=2)
+            written += 1
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic recording files.")
+    parser.add_argument("--out", required=True, help="data folder to create")
+    parser.add_argument("--folders", type=int, default=100, help="number of person folders")
+    parser.add_argument("--per-folder", type=int, default=100, help="recordings per folder")
+    parser.add_argument("--na-rate", type=float, default=0.2, help='share of "NA"/"N/A" label values')
+    parser.add_argument("--missing-rate", type=float, default=0.1, help="share of optional fields left out")
+    parser.add_argument("--summary-words", type=int, default=55, help="mean Summary length in words")
+    parser.add_argument("--days", type=int, default=365, help="recordings span this many days up to now")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = generate(
+        args.out,
+        args.folders,
+        args.per_folder,
+        na_rate=args.na_rate,
+        missing_rate=args.missing_rate,
+        summary_words=args.summary_words,
+        days=args.days,
+        seed=args.seed,
+    )
+    print(f"Wrote {written} recordings to {args.out} in {time.perf_counter() - start:.1f}s")
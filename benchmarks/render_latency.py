@@ -0,0 +1,117 @@
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+# End-to-end script latency of dashboard.py without a browser. The script runs under AppTest
+# against a given data folder, switches between Overview and People and goes through the
+# folder selectbox, then reports p50/p95 rerun times and the size of the elements each view
+# sends. With --max-p95-ms it exits non-zero when a view gets slower than the budget.
+#   python benchmarks/render_latency.py --data /tmp/dashboard_bench/data_10000 --rounds 3
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Nearest-rank percentile
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+# Serialized size of every element in the rendered tree, by element type. Blocks only count
+# their own proto, so nested elements are not counted twice.
+def payload_bytes(at):
+    sizes = Counter()
+    nodes = [at._tree]
+    while nodes:
+        node = nodes.pop()
+        nodes.extend(getattr(node, "children", {}).values())
+        proto = getattr(node, "proto", None)
+        if proto is not None and hasattr(proto, "ByteSize"):
+            sizes[node.type] += proto.ByteSize()
+    return sizes
+
+
+def run(at, action=None):
+    start = time.perf_counter()
+    (action() if action else at).run()
+    ms = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return ms
+
+
+def measure(data_path, rounds, max_folders):
+    from streamlit.testing.v1 import AppTest
+
+    sys.path.insert(0, REPO_DIR)
+    os.chdir(REPO_DIR)
+    at = AppTest.from_file(os.path.join(REPO_DIR, "dashboard.py"), default_timeout=600)
+
+    timings = {"Overview": [], "People": [], "folder switch": []}
+    payloads = {}
+    first_run_ms = run(at)
+    payloads["Overview"] = payload_bytes(at)
+
+    for _ in range(rounds):
+        timings["Overview"].append(run(at, lambda: at.sidebar.radio[0].set_value("Overview")))
+        timings["People"].append(run(at, lambda: at.sidebar.radio[0].set_value("People")))
+        payloads["People"] = payload_bytes(at)
+        for folder in at.main.selectbox[0].options[:max_folders]:
+            timings["folder switch"].append(run(at, lambda: at.main.selectbox[0].set_value(folder)))
+        payloads["folder switch"] = payload_bytes(at)
+    return first_run_ms, timings, payloads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure dashboard rerun latency and payload size.")
+    parser.add_argument("--data", default="data", help="data folder to run the dashboard against")
+    parser.add_argument("--rounds", type=int, default=3, help="passes over both sections")
+    parser.add_argument("--max-folders", type=int, default=20, help="folders to select per pass")
+    parser.add_argument("--live", action="store_true", help="keep live ingestion on, as in production")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    parser.add_argument("--max-p95-ms", type=float, help="fail when a view's p95 exceeds this")
+    args = parser.parse_args()
+
+    # Settings are read from the environment when the script first imports them
+    os.environ["DASHBOARD_DATA_DIR"] = os.path.abspath(args.data)
+    os.environ["DASHBOARD_LIVE_INGEST"] = "1" if args.live else "0"
+    os.environ.setdefault("DASHBOARD_CACHE_DIR", tempfile.mkdtemp(prefix="dashboard_cache_"))
+
+    first_run_ms, timings, payloads = measure(args.data, args.rounds, args.max_folders)
+
+    results = {"data": os.path.abspath(args.data), "first_run_ms": round(first_run_ms, 1), "views": {}}
+    print(f"first run (includes load): {first_run_ms:.0f} ms")
+    print(f"{'':<16}{'runs':>6}{'p50 ms':>10}{'p95 ms':>10}{'payload KB':>12}  largest elements")
+    for view, values in timings.items():
+        if not values:
+            continue
+        sizes = payloads[view]
+        largest = ", ".join(f"{kind} {size / 1024:.0f}" for kind, size in sizes.most_common(3))
+        p50, p95 = percentile(values, 50), percentile(values, 95)
+        print(f"{view:<16}{len(values):>6}{p50:>10.1f}{p95:>10.1f}{sum(sizes.values()) / 1024:>12.1f}  {largest}")
+        results["views"][view] = {
+            "runs": len(values),
+            "p50_ms": round(p50, 1),
+            "p95_ms": round(p95, 1),
+            "payload_bytes": sum(sizes.values()),
+            "payload_by_element": dict(sizes),
+        }
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.max_p95_ms is not None:
+        slow = [view for view, result in results["views"].items() if result["p95_ms"] > args.max_p95_ms]
+        if slow:
+            print(f"p95 over {args.max_p95_ms:.0f} ms: {', '.join(slow)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.websocket import websocket_connect
+
+from startup_time import REPO_DIR, free_port, wait_until_ready
+
+# Cost of changing the People folder with and without the People fragment. A real
+# `streamlit run dashboard.py` server is driven over the websocket like a browser would,
+# and every folder switch is timed from the rerun request to the end of the run:
+#   full rerun       the switch re-runs the whole script, as every widget change did before
+#                    the sections became fragments
+#   fragment rerun   the switch re-runs the People fragment only, as the browser asks for now
+# Both are timed on the same clock, alternating on the same server and session.
+#   python benchmarks/rerun_latency.py --data /tmp/dashboard_bench/data_5050 --rounds 5
+
+FINISHED = {ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY}
+
+
+class Session:
+    def __init__(self, ws, timeout):
+        self.ws = ws
+        self.timeout = timeout
+        self.widget_states = {}
+        # label -> (widget id, options, fragment id) of the radios and selectboxes seen
+        self.widgets = {}
+
+    def set_widget(self, label, index):
+        widget_id = self.widgets[label][0]
+        self.widget_states[widget_id] = index
+
+    # Ask for a rerun with the current widget states and return its milliseconds
+    async def rerun(self, fragment_id=""):
+        request = BackMsg()
+        request.rerun_script.query_string = ""
+        request.rerun_script.fragment_id = fragment_id
+        for widget_id, index in self.widget_states.items():
+            state = request.rerun_script.widget_states.widgets.add()
+            state.id = widget_id
+            state.int_value = index
+        start = time.perf_counter()
+        await self.ws.write_message(request.SerializeToString(), binary=True)
+        while True:
+            data = await asyncio.wait_for(self.ws.read_message(), self.timeout)
+            if data is None:
+                raise RuntimeError("the server closed the session")
+            msg = ForwardMsg()
+            msg.ParseFromString(data)
+            kind = msg.WhichOneof("type")
+            if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                widget = getattr(element, element.WhichOneof("type"))
+                if element.WhichOneof("type") == "exception":
+                    raise RuntimeError(widget.message)
+                if element.WhichOneof("type") in ("radio", "selectbox"):
+                    self.widgets[widget.label] = (widget.id, list(widget.options), msg.delta.fragment_id)
+            elif kind == "script_finished" and msg.script_finished in FINISHED:
+                return (time.perf_counter() - start) * 1000
+
+
+async def measure_switches(port, rounds, timeout):
+    ws = await websocket_connect(f"ws://localhost:{port}/_stcore/stream")
+    session = Session(ws, timeout)
+    await session.rerun()
+    session.set_widget("Go to:", session.widgets["Go to:"][1].index("People"))
+    await session.rerun()
+    _, folders, fragment_id = session.widgets["Select a folder:"]
+    if not fragment_id:
+        raise RuntimeError("the People section is not a fragment")
+
+    full_ms, fragment_ms = [], []
+    for _ in range(rounds):
+        for i in range(len(folders)):
+            session.set_widget("Select a folder:", i)
+            full_ms.append(await session.rerun())
+            session.set_widget("Select a folder:", (i + 1) % len(folders))
+            fragment_ms.append(await session.rerun(fragment_id))
+    ws.close()
+    return full_ms, fragment_ms
+
+
+def measure(rounds, warmup, timeout):
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", os.path.join(REPO_DIR, "dashboard.py"),
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=REPO_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(port, process, timeout)
+        # A first pass loads the corpus and lets the cache warm-up finish
+        asyncio.run(measure_switches(port, 1, timeout))
+        time.sleep(warmup)
+        return asyncio.run(measure_switches(port, rounds, timeout))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure People folder switches with and without the fragment.")
+    parser.add_argument("--data", default="data", help="data folder or JSON Lines export to run the dashboard against")
+    parser.add_argument("--rounds", type=int, default=5, help="passes over every folder")
+    parser.add_argument("--warmup", type=float, default=2, help="seconds to let the cache warm-up finish")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds to wait for each step")
+    args = parser.parse_args()
+
+    # Read by settings in the server process
+    os.environ["DASHBOARD_DATA_DIR"] = os.path.abspath(args.data)
+    os.environ.setdefault("DASHBOARD_LIVE_INGEST", "0")
+    os.environ["DASHBOARD_PREFETCH"] = "0"
+    os.environ["DASHBOARD_CACHE_DIR"] = tempfile.mkdtemp(prefix="dashboard_cache_")
+
+    full_ms, fragment_ms = measure(args.rounds, args.warmup, args.timeout)
+    print(f"{'':<18}{'median ms':>10}{'p90 ms':>10}{'max ms':>10}")
+    for name, values in [("full rerun", full_ms), ("fragment rerun", fragment_ms)]:
+        p90 = statistics.quantiles(values, n=10)[-1] if len(values) > 1 else values[0]
+        print(f"{name:<18}{statistics.median(values):>10.1f}{p90:>10.1f}{max(values):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.websocket import websocket_connect
+
+# Cold start of the dashboard as a new replica sees it. Each run starts a fresh
+# `streamlit run dashboard.py` server, waits for its health check, then opens a session over
+# the websocket like a browser would and times the messages of the first script run:
+#   server ready   process start until /_stcore/health answers
+#   page config    first message of the script (set_page_config)
+#   title          the section title, i.e. the page shell is on screen
+#   first chart    first plotly chart of the Overview
+#   finished       the whole first run, including the corpus load
+# Times after "server ready" are measured from the moment the session asks for its first run.
+# With --sessions several sessions open at once and the slowest one is reported; --prefetch
+# starts the server through serve.py, which loads the corpus before any session connects.
+#   python benchmarks/startup_time.py --data /tmp/dashboard_bench/data_10000 --runs 5
+#   python benchmarks/startup_time.py --data /tmp/dashboard_bench/data_10000 --prefetch --sessions 5 --delay 2
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MILESTONES = ["server ready", "page config", "title", "first chart", "finished"]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port, process, timeout):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {process.returncode}")
+        try:
+            urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.02)
+    raise TimeoutError(f"server not ready after {timeout:.0f}s")
+
+
+# Milliseconds from the rerun request to each milestone of the first script run
+async def first_run(port, timeout):
+    ws = await websocket_connect(f"ws://localhost:{port}/_stcore/stream")
+    request = BackMsg()
+    request.rerun_script.query_string = ""
+    start = time.perf_counter()
+    await ws.write_message(request.SerializeToString(), binary=True)
+
+    times = {}
+    while "finished" not in times:
+        data = await asyncio.wait_for(ws.read_message(), timeout)
+        if data is None:
+            raise RuntimeError("the server closed the session")
+        msg = ForwardMsg()
+        msg.ParseFromString(data)
+        ms = (time.perf_counter() - start) * 1000
+        kind = msg.WhichOneof("type")
+        element = None
+        if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+            element = msg.delta.new_element.WhichOneof("type")
+        if kind == "page_config_changed":
+            times.setdefault("page config", ms)
+        elif element == "heading":
+            times.setdefault("title", ms)
+        elif element == "plotly_chart":
+            times.setdefault("first chart", ms)
+        elif kind == "script_finished":
+            times["finished"] = ms
+    ws.close()
+    return times
+
+
+# Each milestone of the slowest of several sessions opened at once
+async def first_runs(port, sessions, timeout):
+    runs = await asyncio.gather(*(first_run(port, timeout) for _ in range(sessions)))
+    return {milestone: max(run[milestone] for run in runs) for milestone in runs[0]}
+
+
+def measure(prefetch, sessions, delay, timeout):
+    port = free_port()
+    server = [os.path.join(REPO_DIR, "serve.py")] if prefetch else ["-m", "streamlit", "run", os.path.join(REPO_DIR, "dashboard.py")]
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable, *server,
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=REPO_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(port, process, timeout)
+        times = {"server ready": (time.perf_counter() - start) * 1000}
+        # Users arriving some time after the server came up
+        time.sleep(delay)
+        times.update(asyncio.run(first_runs(port, sessions, timeout)))
+        return times
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the dashboard's cold start, from process start to first paint.")
+    parser.add_argument("--data", default="data", help="data folder or JSON Lines export to run the dashboard against")
+    parser.add_argument("--runs", type=int, default=3, help="cold starts to measure")
+    parser.add_argument("--sessions", type=int, default=1, help="sessions opened at once on each server")
+    parser.add_argument("--delay", type=float, default=0, help="seconds between server ready and the sessions opening")
+    parser.add_argument("--prefetch", action="store_true", help="start the server through serve.py")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds to wait for each step")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    # Read by settings in the server process; every run starts from an empty ingest cache
+    os.environ["DASHBOARD_DATA_DIR"] = os.path.abspath(args.data)
+    os.environ.setdefault("DASHBOARD_LIVE_INGEST", "0")
+    os.environ["DASHBOARD_PREFETCH"] = "1" if args.prefetch else "0"
+
+    runs = []
+    for _ in range(args.runs):
+        os.environ["DASHBOARD_CACHE_DIR"] = tempfile.mkdtemp(prefix="dashboard_cache_")
+        runs.append(measure(args.prefetch, args.sessions, args.delay, args.timeout))
+
+    results = {
+        "data": os.path.abspath(args.data),
+        "prefetch": args.prefetch,
+        "sessions": args.sessions,
+        "delay_s": args.delay,
+        "runs": runs,
+        "median_ms": {},
+    }
+    print(f"{'':<14}{'median ms':>10}{'min ms':>10}{'max ms':>10}")
+    for milestone in MILESTONES:
+        values = [run[milestone] for run in runs if milestone in run]
+        if not values:
+            continue
+        median = statistics.median(values)
+        results["median_ms"][milestone] = round(median, 1)
+        print(f"{milestone:<14}{median:>10.0f}{min(values):>10.0f}{max(values):>10.0f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
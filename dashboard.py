@@ -1,12 +1,11 @@
-import pandas as pd
 import streamlit as st
-import os
-import json
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
+from datetime import datetime, timedelta
+
+import perf
+import settings
 
 st.set_page_config(layout="wide", page_title="Sales Dashboard")
+perf.start_run()
 
 # Custom CSS for Shadcn-inspired UI
 st.markdown(
@@ -66,42 +65,107 @@ colors = {
 }
 
 
-# Function to fetch data from nested folders with error handling
-def fetch_data_from_nested_folders(main_folder_path):
-    all_data = []
-    try:
-        for folder_name in os.listdir(main_folder_path):
-            folder_path = os.path.join(main_folder_path, folder_name)
-            if os.path.isdir(folder_path):
-                for filename in os.listdir(folder_path):
-                    if filename.endswith(".json"):
-                        file_path = os.path.join(folder_path, filename)
-                        try:
-                            with open(file_path, "r") as file:
-                                data = json.load(file)
-                                data["Folder"] = folder_name
-                                data["Filename"] = filename
-                                all_data.append(data)
-                        except json.JSONDecodeError:
-                            st.warning(f"Could not decode JSON from {file_path}.")
-    except Exception as e:
-        st.error(f"Error fetching data: {e}")
-
-    return pd.DataFrame(all_data)
+# Call date presets of the sidebar filter, in days back from today
+DATE_RANGES = {"All time": None, "Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90, "Custom": None}
+
+
+# Title of each section, drawn with the sidebar before the data is loaded
+SECTION_TITLES = {"Overview": "Sales Dashboard Overview", "People": "Person-Specific Data", "Search": "Search Calls"}
 
+# Sidebar
+st.sidebar.title("Dashboard Navigation")
+section = st.sidebar.radio("Go to:", ["Overview", "People", "Search"])
+
+# Every KPI and chart covers the calls dated within this range (None for all time)
+period = st.sidebar.selectbox("Call dates", list(DATE_RANGES))
+today = datetime.now().date()
+date_range = None
+if period == "Custom":
+    picked = st.sidebar.date_input("From / to", value=(today - timedelta(days=29), today))
+    # Only the start is set while the user is still picking the end
+    if len(picked) == 2:
+        date_range = tuple(picked)
+elif DATE_RANGES[period]:
+    date_range = (today - timedelta(days=DATE_RANGES[period] - 1), today)
+
+st.title(SECTION_TITLES[section])
+
+# The page shell above only needs streamlit. pandas, the loader and the caches take most of a
+# cold start, so they are imported once the shell is on screen; plotly is imported by the
+# sections that draw charts.
+with perf.stage("imports"):
+    import pandas as pd
+
+    import warmup
+    from aggregates import (
+        course_score_means,
+        course_score_quantiles,
+        cube_score_means,
+        filter_kpi_cube,
+        folder_index,
+        score_histograms,
+        shared_kpi_cube,
+    )
+    from data_export import render_export
+    from data_grid import render_data_grid
+    from data_loader import (
+        current_fingerprint,
+        data_version,
+        filter_shared_recordings,
+        load_shared_recordings,
+        unique_recordings,
+    )
+    from live_ingest import get_live_corpus, uses_live_ingest
+    from search_index import (
+        TEXT_COLUMNS,
+        escape_markdown,
+        recording_positions,
+        shared_search_index,
+        snippet,
+        tokenize,
+    )
 
 # Specify the main folder path where person folders are stored
-main_folder_path = "data"
+main_folder_path = settings.DATA_DIR
 
-# Fetch the data with a loading spinner
-with st.spinner("Loading data..."):
-    df = fetch_data_from_nested_folders(main_folder_path)
+use_live_ingest = uses_live_ingest(main_folder_path)
+
+
+# Latest (frame, load_stats) within the selected date range. The frame is shared by all
+# sessions: never modify it in place. Without live ingestion the range is pushed down into
+# the loader, so only files around the range are read.
+def current_data():
+    if use_live_ingest:
+        df, load_stats, _ = get_live_corpus(main_folder_path).current()
+        if date_range is None:
+            return df, load_stats
+        return filter_shared_recordings(data_version(load_stats), df, load_stats, date_range)
+    return load_shared_recordings(main_folder_path, current_fingerprint(main_folder_path), date_range)
+
+
+# current_data() plus its KPI cube, taken from one version of the data so the two always
+# match; live ingestion keeps its own cube up to date
+def current_data_and_cube():
+    if use_live_ingest:
+        df, load_stats, cube = get_live_corpus(main_folder_path).current()
+        if date_range is not None:
+            df, load_stats = filter_shared_recordings(data_version(load_stats), df, load_stats, date_range)
+        return df, load_stats, filter_kpi_cube(cube, date_range)
+    df, load_stats = current_data()
+    return df, load_stats, shared_kpi_cube(data_version(load_stats), df)
+
+
+# Search index matching current_data(); live ingestion keeps its own index up to date
+def current_search_index():
+    if use_live_ingest:
+        return get_live_corpus(main_folder_path).search_index
+    df, load_stats = current_data()
+    return shared_search_index(data_version(load_stats), df)
 
-# Convert Date to datetime
-if not df.empty and "Date" in df.columns:
-    df["Date"] = pd.to_datetime(df["Date"], format="%d-%m-%Y", errors="coerce")
 
-# Create numeric versions of score columns for calculations and charts
+# Most search results listed at once
+SEARCH_RESULTS = 50
+
 score_columns = [
     "BANT Score",
     "Call Intent Score",
@@ -109,31 +173,59 @@ score_columns = [
     "Sentiment Analysis Score",
     "Detailed Call Score",
 ]
-for col in score_columns:
-    df[f"{col}_numeric"] = pd.to_numeric(df[col], errors="coerce")
-
-# Sidebar
-st.sidebar.title("Dashboard Navigation")
-section = st.sidebar.radio("Go to:", ["Overview", "People"])
-
-
-# Helper function to safely calculate mean
-def safe_mean(series):
-    return series.mean() if not series.empty else "N/A"
 
+# Fetch the data with a loading spinner
+with st.spinner("Loading data..."), perf.stage("load corpus"):
+    df, load_stats = current_data()
 
-# Overview section
-if section == "Overview":
-    st.title("Sales Dashboard Overview")
-    # Total files
-    num_files = df["Filename"].nunique()
-    st.markdown(f"Data of **{num_files*3}**.")
+st.sidebar.caption(
+    f"Loaded {load_stats['files']} files ({load_stats['parsed']} parsed) in {load_stats['seconds']:.2f}s "
+    f"({load_stats['files_per_sec']:.0f} files/sec, {load_stats['mode']} loader, {load_stats['decoder']} decoder)"
+)
+st.sidebar.caption(f"{load_stats['duplicates']} duplicate copies counted once ({settings.DEDUP_POLICY} dedup policy)")
+st.sidebar.caption(
+    f"Data version {load_stats['fingerprint']} · loaded at {load_stats['loaded_at']:%Y-%m-%d %H:%M:%S}"
+)
+if st.sidebar.button("Refresh data"):
+    if use_live_ingest:
+        get_live_corpus(main_folder_path).stop()
+        get_live_corpus.clear()
+    else:
+        load_shared_recordings.clear()
+        current_fingerprint.clear()
+    filter_shared_recordings.clear()
+    st.rerun()
+
+if df.empty:
+    st.info("No recordings in the selected date range.")
+    st.stop()
+
+
+# Helper function to safely look up a mean; scores without any values have none
+def safe_mean(means, col):
+    return means.get(col, "N/A")
+
+
+# Key metrics re-read the latest data on their own timer, so recordings picked up by
+# live ingestion show up on open Overview pages without a full rerun
+@st.fragment(run_every=settings.LIVE_REFRESH_SECONDS if use_live_ingest else None)
+@perf.timed("key metrics")
+def render_key_metrics():
+    with perf.stage("KPI cube"):
+        df, load_stats, cube = current_data_and_cube()
+        means = cube_score_means(cube)
+    # Total recordings, each counted once however many folders it was exported to
+    duplicates = load_stats["duplicates"]
+    st.markdown(
+        f"Data of **{len(df) - duplicates}** recordings"
+        + (f" ({duplicates} duplicate copies counted once)." if duplicates else ".")
+    )
 
     # Key Metrics
     col1, col2, col3, col4, col5 = st.columns(5)
 
     with col1:
-        bant_mean = safe_mean(df["BANT Score_numeric"])
+        bant_mean = safe_mean(means, "BANT Score")
         bant_mean_display = (
             f"{bant_mean:.2f}" if isinstance(bant_mean, float) else bant_mean
         )
@@ -143,7 +235,7 @@ if section == "Overview":
         )
 
     with col2:
-        call_intent_mean = safe_mean(df["Call Intent Score_numeric"])
+        call_intent_mean = safe_mean(means, "Call Intent Score")
         call_intent_mean_display = (
             f"{call_intent_mean:.2f}"
             if isinstance(call_intent_mean, float)
@@ -155,7 +247,7 @@ if section == "Overview":
         )
 
     with col3:
-        spin_mean = safe_mean(df["SPIN Score_numeric"])
+        spin_mean = safe_mean(means, "SPIN Score")
         spin_mean_display = (
             f"{spin_mean:.2f}" if isinstance(spin_mean, float) else spin_mean
         )
@@ -165,7 +257,7 @@ if section == "Overview":
         )
 
     with col4:
-        sentiment_mean = safe_mean(df["Sentiment Analysis Score_numeric"])
+        sentiment_mean = safe_mean(means, "Sentiment Analysis Score")
         sentiment_mean_display = (
             f"{sentiment_mean:.2f}"
             if isinstance(sentiment_mean, float)
@@ -177,7 +269,7 @@ if section == "Overview":
         )
 
     with col5:
-        detailed_call_mean = safe_mean(df["Detailed Call Score_numeric"])
+        detailed_call_mean = safe_mean(means, "Detailed Call Score")
         detailed_call_mean_display = (
             f"{detailed_call_mean:.2f}"
             if isinstance(detailed_call_mean, float)
@@ -188,6 +280,16 @@ if section == "Overview":
             unsafe_allow_html=True,
         )
 
+
+# The radar chart re-runs on its own when its controls change
+@st.fragment
+@perf.timed("radar chart")
+def render_radar_chart():
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    df, load_stats, cube = current_data_and_cube()
+
     # Radar Chart for Course Interested and various scores
 
     # Define categories for the radar chart
@@ -199,70 +301,203 @@ if section == "Overview":
         "Detailed Call Score",
     ]
 
-    # Filter the rows where "Course Interested" is not "N/A"
-    df_radar = df[df["Course Interested"] != "N/A"]
-
-    if not df_radar.empty:
-        radar_fig = go.Figure()
-
-        # Iterate through the filtered DataFrame and add radar chart traces
-        for idx, row in df_radar.iterrows():
-            radar_fig.add_trace(
-                go.Scatterpolar(
-                    r=[
-                        row["BANT Score_numeric"],
-                        row["Call Intent Score_numeric"],
-                        row["SPIN Score_numeric"],
-                        row["Sentiment Analysis Score_numeric"],
-                        row["Detailed Call Score_numeric"],
-                    ],
-                    theta=categories,
-                    fill="toself",
-                    name=row["Course Interested"],
+    # One trace per course with its mean scores, for the courses with the most recordings
+    radar_col1, radar_col2 = st.columns([3, 1])
+    with radar_col1:
+        top_courses = st.slider(
+            "Top courses",
+            min_value=1,
+            max_value=settings.RADAR_MAX_COURSES,
+            value=min(5, settings.RADAR_MAX_COURSES),
+        )
+    with radar_col2:
+        show_bands = st.checkbox("Show 25th-75th percentile bands")
+    course_means = course_score_means(cube, top_courses)
+
+    if not course_means.empty:
+        with perf.stage("radar chart: build"):
+            radar_fig = go.Figure()
+            if show_bands:
+                courses = tuple(course_means.index)
+                version = data_version(load_stats)
+                lower = course_score_quantiles(version, df, courses, 0.25)
+                upper = course_score_quantiles(version, df, courses, 0.75)
+
+            for i, (course, means) in enumerate(course_means.iterrows()):
+                color = px.colors.qualitative.Plotly[i % len(px.colors.qualitative.Plotly)]
+                radar_fig.add_trace(
+                    go.Scatterpolar(
+                        r=means[categories].values,
+                        theta=categories,
+                        fill="toself",
+                        name=course,
+                        legendgroup=course,
+                        line=dict(color=color),
+                    )
                 )
+                if show_bands:
+                    for band in (lower, upper):
+                        radar_fig.add_trace(
+                            go.Scatterpolar(
+                                r=band.loc[course, categories].values,
+                                theta=categories,
+                                name=course,
+                                legendgroup=course,
+                                showlegend=False,
+                                line=dict(color=color, dash="dot", width=1),
+                            )
+                        )
+
+            radar_fig.update_layout(
+                polar=dict(
+                    radialaxis=dict(
+                        visible=True, range=[0, 10]
+                    )  # Adjust the range according to your score scale
+                ),
+                showlegend=True,
+                title="Radar Chart: Course Interested vs Scores",
             )
 
-        radar_fig.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True, range=[0, 10]
-                )  # Adjust the range according to your score scale
-            ),
-            showlegend=True,
-            title="Radar Chart: Course Interested vs Scores",
-        )
-
-        st.plotly_chart(radar_fig, use_container_width=True)
+        perf.plotly_chart("radar chart", radar_fig)
     else:
         st.info("No data available for 'Course Interested' field.")
 
+
+# The People section re-runs on its own when the folder or grid controls change, leaving
+# the load and the Overview untouched
+@st.fragment
+@perf.timed("People section")
+def render_people():
+    from figures import average_scores_figure, sentiment_over_time_figure
+
+    df, load_stats = current_data()
+
+    # Dropdown to select a specific folder
+    with perf.stage("folder index"):
+        index = folder_index(data_version(load_stats), df)
+    folder_options = index.folders
+    selected_folder = st.selectbox("Select a folder:", folder_options)
+
+    # Look up the rows of the selected folder
+    folder_data = index.rows(selected_folder)
+
+    st.subheader(f"Data for {selected_folder}")
+
+    # Display folder-specific data in a paginated table
+    grid_rows = render_data_grid(folder_data, key="folder_data")
+    render_export(grid_rows, key="folder_export", file_stem=f"recordings_{selected_folder}")
+
+    # Person-specific charts (you can customize these based on your needs)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown('<div class="line-v">', unsafe_allow_html=True)
+        # Example: Average scores for the selected folder
+        with perf.stage("average scores: build"):
+            average_scores = index.score_means.reindex(score_columns, axis=1).loc[selected_folder]
+            fig_scores = average_scores_figure(average_scores)
+        perf.plotly_chart("average scores", fig_scores)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with col2:
+        st.markdown('<div class="line-v">', unsafe_allow_html=True)
+        # Example: Sentiment Analysis over time for the folder
+        with perf.stage("sentiment over time: build"):
+            fig_sentiment = sentiment_over_time_figure(folder_data)
+        perf.plotly_chart("sentiment over time", fig_sentiment)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+
+# The Search section re-runs on its own as the query changes
+@st.fragment
+@perf.timed("Search section")
+def render_search():
+    df, load_stats = current_data()
+    query = st.text_input("Search call summaries and feedback", placeholder="fee, placement, a lead's name")
+    if not query:
+        return
+    if not tokenize(query):
+        st.info("Those words are too common to search for; try more specific ones.")
+        return
+
+    with perf.stage("search index"):
+        index = current_search_index()
+    if not index.ready:
+        st.info("The search index is still being built, try again in a moment.")
+        return
+
+    # Matches come from the index; only the matching rows are looked up in the frame
+    with perf.stage("search"):
+        keys = index.search(query)
+        positions, _ = recording_positions(data_version(load_stats), df).get_indexer_non_unique(keys)
+        # Each recording is listed once, as its counted copy, latest call first. The index
+        # returns matches in the order they were added, which is not the call Date order.
+        matches = unique_recordings(df.take(positions[positions >= 0]))
+        matches = matches.sort_values("Date", ascending=False, kind="stable")
+    st.caption(
+        f"{len(matches)} recordings match · searched in {st.session_state['perf_last_ms']['search']:.1f} ms"
+        + (f" · showing the latest {SEARCH_RESULTS}" if len(matches) > SEARCH_RESULTS else "")
+    )
+
+    for _, record in matches.head(SEARCH_RESULTS).iterrows():
+        date = f"{record['Date']:%Y-%m-%d}" if pd.notna(record["Date"]) else "no date"
+        lines = [f"**{escape_markdown(record['Folder'])}** · {escape_markdown(record['Filename'])} · {date}"]
+        for col in TEXT_COLUMNS:
+            excerpt = snippet(record.get(col), query)
+            if excerpt:
+                lines.append(f"<i>{col}:</i> {excerpt}")
+        st.markdown("<br>".join(lines), unsafe_allow_html=True)
+
+
+# Overview section
+if section == "Overview":
+    import plotly.express as px
+
+    # The frame and the cube of the rest of the Overview come from the same data version
+    with perf.stage("KPI cube"):
+        df, load_stats, cube = current_data_and_cube()
+    render_export(
+        unique_recordings(df),
+        key="overview_export",
+        file_stem="recordings" + (f"_{date_range[0]:%Y%m%d}-{date_range[1]:%Y%m%d}" if date_range else ""),
+    )
+    render_key_metrics()
+    render_radar_chart()
+
     st.markdown('<div class="line-v"> </div>', unsafe_allow_html=True)
 
     # Charts
+    with perf.stage("histogram binning"):
+        histograms = score_histograms(data_version(load_stats), df)
     col1, col2 = st.columns(2)  # Use 4 columns for more charts
 
     with col1:
-        fig_bant = px.histogram(
-            df,
-            x="BANT Score",
-            title="BANT Score Distribution",
-            color_discrete_sequence=[colors["primary"]],
-        )
-        fig_bant.update_layout(bargap=0.2, plot_bgcolor="white", paper_bgcolor="white")
-        st.plotly_chart(fig_bant, use_container_width=True)
+        with perf.stage("BANT histogram: build"):
+            fig_bant = px.bar(
+                histograms,
+                x=histograms.index,
+                y="BANT Score",
+                labels={"Score": "BANT Score", "BANT Score": "count"},
+                title="BANT Score Distribution",
+                color_discrete_sequence=[colors["primary"]],
+            )
+            fig_bant.update_layout(bargap=0.2, plot_bgcolor="white", paper_bgcolor="white")
+        perf.plotly_chart("BANT histogram", fig_bant)
         st.markdown("</div>", unsafe_allow_html=True)
 
     with col2:
-        fig_intent = px.histogram(
-            df,
-            x="Call Intent Score",
-            title="Call Intent Score Distribution",
-            color_discrete_sequence=[colors["secondary"]],
-        )
-        fig_intent.update_layout(
-            bargap=0.2, plot_bgcolor="white", paper_bgcolor="white"
-        )
-        st.plotly_chart(fig_intent, use_container_width=True)
+        with perf.stage("Call Intent histogram: build"):
+            fig_intent = px.bar(
+                histograms,
+                x=histograms.index,
+                y="Call Intent Score",
+                labels={"Score": "Call Intent Score", "Call Intent Score": "count"},
+                title="Call Intent Score Distribution",
+                color_discrete_sequence=[colors["secondary"]],
+            )
+            fig_intent.update_layout(
+                bargap=0.2, plot_bgcolor="white", paper_bgcolor="white"
+            )
+        perf.plotly_chart("Call Intent histogram", fig_intent)
         st.markdown("</div>", unsafe_allow_html=True)
 
     st.markdown('<div class="line-v">', unsafe_allow_html=True)
@@ -270,52 +505,59 @@ if section == "Overview":
     col1, col2 = st.columns(2)  # Use 4 columns for more charts
 
     with col1:
-        fig_spin = px.histogram(
-            df,
-            x="SPIN Score",
-            title="SPIN Score Distribution",
-            color_discrete_sequence=[colors["tertiary"]],
-        )
-        fig_spin.update_layout(bargap=0.2, plot_bgcolor="white", paper_bgcolor="white")
-        st.plotly_chart(fig_spin, use_container_width=True)
+        with perf.stage("SPIN histogram: build"):
+            fig_spin = px.bar(
+                histograms,
+                x=histograms.index,
+                y="SPIN Score",
+                labels={"Score": "SPIN Score", "SPIN Score": "count"},
+                title="SPIN Score Distribution",
+                color_discrete_sequence=[colors["tertiary"]],
+            )
+            fig_spin.update_layout(bargap=0.2, plot_bgcolor="white", paper_bgcolor="white")
+        perf.plotly_chart("SPIN histogram", fig_spin)
 
     with col2:
-        fig_sentiment = px.histogram(
-            df,
-            x="Sentiment Analysis Score",
-            title="Sentiment Analysis Score Distribution",
-            color_discrete_sequence=[colors["quaternary"]],
-        )
-        fig_sentiment.update_layout(
-            bargap=0.2, plot_bgcolor="white", paper_bgcolor="white"
-        )
-        st.plotly_chart(fig_sentiment, use_container_width=True)
+        with perf.stage("Sentiment histogram: build"):
+            fig_sentiment = px.bar(
+                histograms,
+                x=histograms.index,
+                y="Sentiment Analysis Score",
+                labels={"Score": "Sentiment Analysis Score", "Sentiment Analysis Score": "count"},
+                title="Sentiment Analysis Score Distribution",
+                color_discrete_sequence=[colors["quaternary"]],
+            )
+            fig_sentiment.update_layout(
+                bargap=0.2, plot_bgcolor="white", paper_bgcolor="white"
+            )
+        perf.plotly_chart("Sentiment histogram", fig_sentiment)
 
     col1, col2 = st.columns(2)  # Use 4 columns for more charts
     with col1:
         # Pie Chart for score proportions
         st.markdown('<div class="line-v"> </div>', unsafe_allow_html=True)
-        pie_data = df[
-            [
-                "BANT Score_numeric",
-                "Call Intent Score_numeric",
-                "SPIN Score_numeric",
-                "Sentiment Analysis Score_numeric",
-            ]
-        ].mean()
-        fig_pie = px.pie(
-            pie_data,
-            values=pie_data.values,
-            names=pie_data.index,
-            title="Average Score Distribution",
-            color_discrete_sequence=[
-                colors["secondary"],
-                colors["tertiary"],
-                colors["primary"],
-                colors["quaternary"],
-            ],
-        )
-        st.plotly_chart(fig_pie, use_container_width=True)
+        with perf.stage("pie chart: build"):
+            pie_data = cube_score_means(cube).reindex(
+                [
+                    "BANT Score",
+                    "Call Intent Score",
+                    "SPIN Score",
+                    "Sentiment Analysis Score",
+                ]
+            )
+            fig_pie = px.pie(
+                pie_data,
+                values=pie_data.values,
+                names=pie_data.index,
+                title="Average Score Distribution",
+                color_discrete_sequence=[
+                    colors["secondary"],
+                    colors["tertiary"],
+                    colors["primary"],
+                    colors["quaternary"],
+                ],
+            )
+        perf.plotly_chart("pie chart", fig_pie)
         st.markdown("</div>", unsafe_allow_html=True)
 
     with col2:
@@ -324,70 +566,42 @@ if section == "Overview":
         st.subheader("Lead City Distribution")
 
         # Group by Lead City, including "N/A"
-        city_counts = df["Lead City"].value_counts(dropna=False).reset_index()
-        city_counts.columns = ["Lead City", "Count"]
-
-        # Create bar chart for Lead City
-        fig_lead_city = px.bar(
-            city_counts,
-            x="Lead City",
-            y="Count",
-            title="Lead City Distribution",
-            text="Count",
-            color_discrete_sequence=[colors["primary"]],
-        )
+        with perf.stage("Lead City chart: build"):
+            city_counts = unique_recordings(df)["Lead City"].value_counts(dropna=False).reset_index()
+            city_counts.columns = ["Lead City", "Count"]
+            # Categoricals also count cities that no longer have any recordings
+            city_counts = city_counts[city_counts["Count"] > 0]
+
+            # Create bar chart for Lead City
+            fig_lead_city = px.bar(
+                city_counts,
+                x="Lead City",
+                y="Count",
+                title="Lead City Distribution",
+                text="Count",
+                color_discrete_sequence=[colors["primary"]],
+            )
 
-        fig_lead_city.update_layout(
-            xaxis_title="Lead City",
-            yaxis_title="Count",
-            plot_bgcolor="white",
-            paper_bgcolor="white",
-        )
+            fig_lead_city.update_layout(
+                xaxis_title="Lead City",
+                yaxis_title="Count",
+                plot_bgcolor="white",
+                paper_bgcolor="white",
+            )
 
-        st.plotly_chart(fig_lead_city, use_container_width=True)
+        perf.plotly_chart("Lead City chart", fig_lead_city)
 
 
 # People section
 elif section == "People":
-    st.title("Person-Specific Data")
-
-    # Dropdown to select a specific folder
-    folder_options = df["Folder"].unique()
-    selected_folder = st.selectbox("Select a folder:", folder_options)
-
-    # Filter the data for the selected folder
-    folder_data = df[df["Folder"] == selected_folder]
+    render_people()
 
-    st.subheader(f"Data for {selected_folder}")
-
-    # Display folder-specific data in a table format
-    st.dataframe(folder_data)
+# Search section
+elif section == "Search":
+    render_search()
 
-    # Person-specific charts (you can customize these based on your needs)
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown('<div class="line-v">', unsafe_allow_html=True)
-        # Example: Average scores for the selected folder
-        # Convert non-numeric values to NaN and calculate the mean
-        numeric_scores = folder_data[score_columns].apply(
-            pd.to_numeric, errors="coerce"
-        )
-        average_scores = numeric_scores.mean()
-        fig_scores = go.Figure(
-            data=[go.Bar(x=average_scores.index, y=average_scores.values)]
-        )
-        fig_scores.update_layout(title="Average Scores")
-        st.plotly_chart(fig_scores, use_container_width=True)
-        st.markdown("</div>", unsafe_allow_html=True)
+# Build the caches of the other sections in the background once this run is done, so the first
+# switch to People or Search finds them ready without slowing down the first paint
+warmup.warm_caches(df, load_stats, live=use_live_ingest)
 
-    with col2:
-        st.markdown('<div class="line-v">', unsafe_allow_html=True)
-        # Example: Sentiment Analysis over time for the folder
-        fig_sentiment = px.line(
-            folder_data,
-            x="Date",
-            y="Sentiment Analysis Score",
-            title="Sentiment Analysis Over Time",
-        )
-        st.plotly_chart(fig_sentiment, use_container_width=True)
-        st.markdown("</div>", unsafe_allow_html=True)
+perf.finish_run(section, load_stats)
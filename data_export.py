@@ -0,0 +1,89 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from data_loader import recording_oids
+
+# Format name -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+# Rows converted at a time; only one converted chunk is in memory besides the frame itself
+EXPORT_CHUNK_ROWS = 50_000
+
+# Exports are written on a small shared pool, so a burst of large exports queues up
+# instead of competing with every session's reruns for the CPU
+_export_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="export")
+
+
+# Rows of one chunk as they are exported: the Mongo _id object becomes its oid string
+def _export_chunk(chunk):
+    if "_id" in chunk.columns:
+        chunk = chunk.assign(_id=recording_oids(chunk))
+    return chunk
+
+
+# Parquet schema of the export. Text columns that are empty in the first rows would be
+# typed null and reject later chunks, so every untyped column is written as strings.
+def _parquet_schema(rows):
+    schema = pa.Schema.from_pandas(_export_chunk(rows.iloc[:EXPORT_CHUNK_ROWS]), preserve_index=False)
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(i, field.with_type(pa.string()))
+    return schema
+
+
+# Write rows to a temporary file chunk by chunk and return its path. Each chunk is sliced
+# and converted on its own, so no second full copy of the frame is made.
+def write_export(rows, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    extension, _ = EXPORT_FORMATS[fmt]
+    fd, path = tempfile.mkstemp(prefix="dashboard_export_", suffix=f".{extension}")
+    try:
+        if fmt == "CSV":
+            with os.fdopen(fd, "w", newline="", encoding="utf-8") as file:
+                for start in range(0, max(len(rows), 1), chunk_rows):
+                    chunk = _export_chunk(rows.iloc[start : start + chunk_rows])
+                    chunk.to_csv(file, header=start == 0, index=False)
+        else:
+            os.close(fd)
+            schema = _parquet_schema(rows)
+            with pq.ParquetWriter(path, schema) as writer:
+                for start in range(0, len(rows), chunk_rows):
+                    chunk = _export_chunk(rows.iloc[start : start + chunk_rows])
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+# Format picker plus a button that writes the rows in the background and offers the file
+def render_export(rows, key, file_stem):
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        fmt = st.selectbox("Export format", list(EXPORT_FORMATS), key=f"{key}_format", label_visibility="collapsed")
+    with col2:
+        prepare = st.button(f"Export {len(rows)} recordings", key=f"{key}_prepare")
+    if not prepare:
+        return
+
+    extension, mime = EXPORT_FORMATS[fmt]
+    with st.spinner(f"Writing {fmt} export..."):
+        path = _export_pool.submit(write_export, rows, fmt).result()
+    try:
+        with open(path, "rb") as file:
+            st.download_button(
+                f"Download {file_stem}.{extension}",
+                file,
+                file_name=f"{file_stem}.{extension}",
+                mime=mime,
+                key=f"{key}_download",
+            )
+    finally:
+        os.remove(path)
@@ -0,0 +1,69 @@
+import math
+
+import streamlit as st
+
+# Long free-text columns are kept out of the grid and only sent for the expanded row
+LONG_TEXT_COLUMNS = ["Summary", "Feedback for improvement"]
+
+# Columns the grid cannot sort or filter on (the Mongo _id is a nested object)
+HIDDEN_COLUMNS = ["_id"]
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+# Sorted, filtered and paginated table of rows. Sorting, filtering and paging happen on the
+# server, so only the visible page of the selected columns is sent to the browser.
+# Returns the filtered and sorted rows across all pages.
+def render_data_grid(rows, key):
+    grid_columns = [col for col in rows.columns if col not in LONG_TEXT_COLUMNS + HIDDEN_COLUMNS]
+
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        columns = st.multiselect("Columns", grid_columns, default=grid_columns, key=f"{key}_columns")
+    with col2:
+        sort_by = st.selectbox(
+            "Sort by",
+            [None, *grid_columns],
+            format_func=lambda col: "(unsorted)" if col is None else col,
+            key=f"{key}_sort",
+        )
+    with col3:
+        descending = st.toggle("Descending", key=f"{key}_descending")
+
+    col1, col2, col3 = st.columns([2, 3, 1])
+    with col1:
+        filter_column = st.selectbox("Filter on", grid_columns, key=f"{key}_filter_column")
+    with col2:
+        filter_text = st.text_input("Contains", key=f"{key}_filter_text")
+    with col3:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+
+    if filter_text and filter_column:
+        matches = rows[filter_column].astype(str).str.contains(filter_text, case=False, regex=False)
+        rows = rows[matches]
+    if sort_by:
+        rows = rows.sort_values(sort_by, ascending=not descending, na_position="last")
+
+    pages = max(1, math.ceil(len(rows) / page_size))
+    page = st.number_input("Page", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    page_rows = rows.iloc[(page - 1) * page_size : page * page_size]
+    st.caption(f"{len(rows)} recordings · page {page} of {pages} · select a row to see its call details")
+
+    event = st.dataframe(
+        page_rows[columns],
+        on_select="rerun",
+        selection_mode="single-row",
+        key=f"{key}_table",
+    )
+
+    # Long text is only fetched for the row the user expanded. A selection made on a
+    # longer page can point past the end of this one.
+    selected = [row for row in event.selection.rows if row < len(page_rows)]
+    if selected:
+        record = page_rows.iloc[selected[0]]
+        with st.expander(f"Call details: {record['Filename']}", expanded=True):
+            for col in LONG_TEXT_COLUMNS:
+                if col in record.index:
+                    st.markdown(f"**{col}**")
+                    st.write(record[col])
+    return rows
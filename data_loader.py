@@ -0,0 +1,662 @@
+import hashlib
+import io
+import json
+import os
+import pickle
+import re
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import settings
+
+try:
+    import orjson
+except ImportError:  # optional, faster drop-in for json.loads
+    orjson = None
+
+try:
+    import pyarrow as pa
+    from pyarrow import json as pa_json
+except ImportError:
+    pa = pa_json = None
+
+# Bump when the layout of the ingest cache changes so stale caches are rebuilt
+INGEST_CACHE_VERSION = 4
+SNAPSHOT_VERSION = 3
+SNAPSHOT_MANIFEST = "_manifest.json"
+
+SCORE_COLUMNS = [
+    "BANT Score",
+    "Call Intent Score",
+    "SPIN Score",
+    "Sentiment Analysis Score",
+    "Detailed Call Score",
+]
+
+# Spellings of a missing value found in the recordings
+MISSING_VALUES = {"N/A", "NA"}
+
+# Epoch milliseconds in a recording file name: recording_<ms>.json, or "recording <ms>.txt" in exports
+RECORDING_TIMESTAMP = re.compile(r"recording[_ ](\d+)")
+
+# Column types applied at load time. Scores are 0-10, so they fit in a nullable int8;
+# repeated free-form labels are stored once per distinct value as categoricals.
+RECORDING_SCHEMA = {
+    **{col: "Int8" for col in SCORE_COLUMNS},
+    "Date": "datetime64[ns]",
+    "Folder": "category",
+    "Course Interested": "category",
+    "Lead City": "category",
+    "Lead interest level": "category",
+    "Lead Occupation": "category",
+    "Lead Busy": "category",
+    "Lead Education": "category",
+    "Lead inquiry for": "category",
+    "Lead Company": "category",
+    "Lead Ctc": "category",
+    "Lead Experience": "category",
+}
+
+
+# Function to fetch data from nested folders with error handling
+def fetch_data_from_nested_folders(main_folder_path):
+    if is_jsonl_export(main_folder_path):
+        return fetch_data_from_jsonl(main_folder_path)[0]
+    all_data = []
+    try:
+        for folder_name in os.listdir(main_folder_path):
+            folder_path = os.path.join(main_folder_path, folder_name)
+            if os.path.isdir(folder_path):
+                for filename in os.listdir(folder_path):
+                    if filename.endswith(".json"):
+                        file_path = os.path.join(folder_path, filename)
+                        try:
+                            with open(file_path, "r") as file:
+                                data = json.load(file)
+                                data["Folder"] = folder_name
+                                data["Filename"] = filename
+                                all_data.append(data)
+                        except json.JSONDecodeError:
+                            st.warning(f"Could not decode JSON from {file_path}.")
+    except Exception as e:
+        st.error(f"Error fetching data: {e}")
+
+    return pd.DataFrame(all_data)
+
+
+# Range of recording timestamps (epoch ms) that can hold calls dated within date_range
+def recording_window(date_range, slack_days=settings.DATE_FILTER_SLACK_DAYS):
+    start, end = date_range
+    slack = pd.Timedelta(days=slack_days)
+    low = pd.Timestamp(start) - slack
+    high = pd.Timestamp(end) + pd.Timedelta(days=1) + slack
+    return low.value // 10**6, high.value // 10**6
+
+
+# Walk the data tree once with os.scandir and list (folder, filename, path, size, mtime) of every JSON file.
+# With a date_range, files whose name puts them outside recording_window are skipped before
+# they are stat'ed; files without a timestamp in their name are always listed.
+def scan_recording_files(main_folder_path, date_range=None):
+    low, high = recording_window(date_range) if date_range else (None, None)
+    entries = []
+    with os.scandir(main_folder_path) as folders:
+        for folder in folders:
+            if not folder.is_dir():
+                continue
+            with os.scandir(folder.path) as files:
+                for file in files:
+                    if low is not None:
+                        match = RECORDING_TIMESTAMP.match(file.name)
+                        if match and not low <= int(match.group(1)) < high:
+                            continue
+                    if file.name.endswith(".json") and file.is_file():
+                        stat = file.stat()
+                        entries.append(
+                            (folder.name, file.name, file.path, stat.st_size, stat.st_mtime_ns)
+                        )
+    return entries
+
+
+# Decoder used for a configured name; decoders that are not installed fall back to "auto"
+def resolve_decoder(name=settings.JSON_DECODER):
+    if name == "orjson" and orjson is not None:
+        return "orjson"
+    if name == "pyarrow" and pa_json is not None:
+        return "pyarrow"
+    if name == "stdlib":
+        return "stdlib"
+    return "orjson" if orjson is not None else "stdlib"
+
+
+def _read_bytes(entry):
+    with open(entry[2], "rb") as file:
+        return file.read()
+
+
+# Read a single recording; returns None when the file is not valid JSON.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so both decoders fail the same way.
+def read_recording(entry, decoder=settings.JSON_DECODER):
+    folder_name, filename = entry[:2]
+    raw = _read_bytes(entry)
+    try:
+        data = orjson.loads(raw) if resolve_decoder(decoder) == "orjson" else json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+    data["Folder"] = folder_name
+    data["Filename"] = filename
+    return data
+
+
+# Read the given entries, serially or across a thread pool, and return the parsed records
+def read_recordings(entries, mode=settings.LOADER_MODE, max_workers=settings.LOADER_WORKERS, decoder=settings.JSON_DECODER):
+    decoder = resolve_decoder(decoder)
+    if decoder == "pyarrow":
+        # Records are decoded one by one here; only read_recordings_frame reads whole batches
+        decoder = resolve_decoder("auto")
+    if mode == "parallel":
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda entry: read_recording(entry, decoder), entries))
+    else:
+        results = [read_recording(entry, decoder) for entry in entries]
+
+    all_data = []
+    # Warnings are raised here rather than in the workers, which have no script context
+    for entry, data in zip(entries, results):
+        if data is None:
+            st.warning(f"Could not decode JSON from {entry[2]}.")
+        else:
+            all_data.append(data)
+    return all_data
+
+
+# Parse every file of a batch with one call to pyarrow's JSON reader. The files are
+# concatenated as line-delimited JSON, so values go straight into Arrow columns without
+# building a dict per recording.
+def _read_recordings_arrow(entries, mode, max_workers):
+    if mode == "parallel":
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            raws = list(executor.map(_read_bytes, entries))
+    else:
+        raws = [_read_bytes(entry) for entry in entries]
+    table = pa_json.read_json(
+        io.BytesIO(b"\n".join(raws)),
+        parse_options=pa_json.ParseOptions(newlines_in_values=True),
+    )
+    if table.num_rows != len(entries):
+        raise pa.ArrowInvalid(f"{len(entries)} files decoded to {table.num_rows} records")
+    df = table.to_pandas()
+    df["Filename"] = [entry[1] for entry in entries]
+    df["Folder"] = [entry[0] for entry in entries]
+    return df
+
+
+# Read the given entries into a frame (before apply_schema). The stdlib and orjson decoders
+# go through a list of records, which pd.DataFrame turns into columns faster than
+# per-column lists built in Python would.
+def read_recordings_frame(entries, mode=settings.LOADER_MODE, max_workers=settings.LOADER_WORKERS, decoder=settings.JSON_DECODER):
+    decoder = resolve_decoder(decoder)
+    if decoder == "pyarrow" and entries:
+        try:
+            return _read_recordings_arrow(entries, mode, max_workers)
+        except pa.ArrowInvalid:
+            # A broken file, or a field whose type differs between files; decoding file by
+            # file finds and reports the broken ones
+            pass
+    return pd.DataFrame(read_recordings(entries, mode=mode, max_workers=max_workers, decoder=decoder))
+
+
+# Same result as fetch_data_from_nested_folders, but files are read across a thread pool
+def fetch_data_parallel(main_folder_path, max_workers=settings.LOADER_WORKERS):
+    try:
+        entries = scan_recording_files(main_folder_path)
+        return read_recordings_frame(entries, mode="parallel", max_workers=max_workers)
+    except Exception as e:
+        st.error(f"Error fetching data: {e}")
+
+    return pd.DataFrame()
+
+
+# Cache location for a data folder; each data folder gets its own manifest and frame
+def ingest_cache_path(main_folder_path, cache_dir=settings.CACHE_DIR):
+    folder_key = hashlib.sha1(os.path.abspath(main_folder_path).encode()).hexdigest()[:12]
+    return os.path.join(cache_dir, folder_key)
+
+
+def _read_ingest_cache(cache_path):
+    try:
+        with open(os.path.join(cache_path, "manifest.json"), "r") as file:
+            manifest = json.load(file)
+        if manifest.get("version") != INGEST_CACHE_VERSION:
+            return {}, None
+        df = pd.read_pickle(os.path.join(cache_path, "recordings.pkl"))
+    except (OSError, ValueError, pickle.UnpicklingError):
+        return {}, None
+    return manifest["files"], df
+
+
+def _write_ingest_cache(cache_path, files, df):
+    os.makedirs(cache_path, exist_ok=True)
+    # Write to temporary files first so a crash never leaves a half-written cache behind
+    frame_path = os.path.join(cache_path, "recordings.pkl")
+    df.to_pickle(frame_path + ".tmp")
+    os.replace(frame_path + ".tmp", frame_path)
+    manifest_path = os.path.join(cache_path, "manifest.json")
+    with open(manifest_path + ".tmp", "w") as file:
+        json.dump({"version": INGEST_CACHE_VERSION, "files": files}, file)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+
+# Call dates, parsed once at ingest. A Date that is missing or not dd-mm-YYYY falls back
+# to the day of the recording_<ms> timestamp in the file name (UTC). Returns the dates and
+# a mask of the rows that fell back.
+def parse_call_dates(df):
+    dates = pd.to_datetime(df["Date"], format="%d-%m-%Y", errors="coerce")
+    recorded = pd.to_datetime(recording_timestamps(df).astype("float64"), unit="ms").dt.normalize()
+    from_filename = dates.isna() & recorded.notna()
+    return dates.fillna(recorded), from_filename
+
+
+# Apply RECORDING_SCHEMA; columns that already have their declared type are left alone
+def apply_schema(df):
+    if "Date" not in df.columns and "Filename" in df.columns:
+        # No recording in the batch has a Date; every date comes from the file names
+        df["Date"] = None
+    for col, dtype in RECORDING_SCHEMA.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        if dtype == "Int8":
+            # Anything that is not a whole score from 0 to 10 is treated as missing
+            scores = pd.to_numeric(df[col], errors="coerce")
+            df[col] = scores.where(scores.between(0, 10) & (scores % 1 == 0)).astype("Int8")
+        elif dtype == "datetime64[ns]":
+            df[col], df["Date from filename"] = parse_call_dates(df)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+# Concatenate recording frames. Categoricals with different categories concatenate
+# to object, so the schema is applied again on the result.
+def concat_recordings(frames):
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    return apply_schema(pd.concat(frames, ignore_index=True))
+
+
+# Rows with a call Date within date_range (start and end dates inclusive)
+def filter_by_date(df, date_range):
+    if date_range is None or df.empty:
+        return df
+    start, end = date_range
+    dates = df["Date"]
+    in_range = (dates >= pd.Timestamp(start)) & (dates < pd.Timestamp(end) + pd.Timedelta(days=1))
+    return df[in_range].reset_index(drop=True)
+
+
+# "<folder>/<filename>" key of every row, matching the keys of manifest_files
+def recording_keys(df):
+    return df["Folder"].astype(str) + "/" + df["Filename"]
+
+
+# Key each file by "<folder>/<filename>" with its (size, mtime) so changes can be detected
+def manifest_files(entries):
+    return {f"{entry[0]}/{entry[1]}": [entry[3], entry[4]] for entry in entries}
+
+
+# Parse the entries that differ from previous_files and merge them into previous_df.
+# Returns the merged frame and the number of files that had to be parsed.
+def merge_changed_recordings(entries, previous_files, previous_df, mode=settings.LOADER_MODE):
+    files = manifest_files(entries)
+    changed = [entry for entry in entries if previous_files.get(f"{entry[0]}/{entry[1]}") != [entry[3], entry[4]]]
+    frames = [apply_schema(read_recordings_frame(changed, mode=mode))]
+    if previous_df is not None and not previous_df.empty:
+        # Keep rows of files that still exist and did not change
+        unchanged = {key for key, stat in files.items() if previous_files.get(key) == stat}
+        frames.insert(0, previous_df[recording_keys(previous_df).isin(unchanged)])
+    return concat_recordings(frames), len(changed)
+
+
+# Load the data tree, parsing only the files that are new or changed since the last load.
+# The Parquet snapshot, when present, seeds the very first load. No frame is kept here:
+# load_shared_recordings holds the one in-memory copy of the corpus.
+def fetch_data_incremental(main_folder_path, mode=settings.LOADER_MODE):
+    cache_path = ingest_cache_path(main_folder_path)
+    entries = scan_recording_files(main_folder_path)
+    files = manifest_files(entries)
+
+    previous_files, previous_df = _read_ingest_cache(cache_path)
+    if previous_df is None:
+        previous_files, previous_df = read_snapshot(main_folder_path)
+    if previous_df is not None and previous_files == files:
+        return previous_df, 0
+
+    df, parsed = merge_changed_recordings(entries, previous_files, previous_df, mode=mode)
+    _write_ingest_cache(cache_path, files, df)
+    return df, parsed
+
+
+# Compact the JSON tree into a Parquet dataset partitioned by month of the call Date
+def write_snapshot(main_folder_path, snapshot_path=settings.SNAPSHOT_DIR, mode=settings.LOADER_MODE):
+    entries = scan_recording_files(main_folder_path)
+    df = apply_schema(read_recordings_frame(entries, mode=mode))
+    if df.empty:
+        raise ValueError(f"No recordings found under {main_folder_path}")
+    df["Month"] = df["Date"].dt.strftime("%Y-%m").fillna("unknown")
+
+    # Build the new snapshot next to the old one and swap it in once it is complete
+    tmp_path = snapshot_path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    df.to_parquet(tmp_path, partition_cols=["Month"], index=False)
+    with open(os.path.join(tmp_path, SNAPSHOT_MANIFEST), "w") as file:
+        json.dump(
+            {
+                "version": SNAPSHOT_VERSION,
+                "data_path": os.path.abspath(main_folder_path),
+                "created_at": time.time(),
+                "files": manifest_files(entries),
+            },
+            file,
+        )
+    shutil.rmtree(snapshot_path, ignore_errors=True)
+    os.replace(tmp_path, snapshot_path)
+    return len(df)
+
+
+# Read the Parquet snapshot of main_folder_path; returns (manifest files, frame) or ({}, None).
+# With a date_range only the Month partitions overlapping it are read.
+def read_snapshot(main_folder_path, snapshot_path=settings.SNAPSHOT_DIR, date_range=None):
+    try:
+        with open(os.path.join(snapshot_path, SNAPSHOT_MANIFEST), "r") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}, None
+    if manifest.get("version") != SNAPSHOT_VERSION or manifest.get("data_path") != os.path.abspath(main_folder_path):
+        return {}, None
+    filters = None
+    if date_range:
+        start, end = date_range
+        filters = [("Month", ">=", f"{start:%Y-%m}"), ("Month", "<=", f"{end:%Y-%m}")]
+    df = pd.read_parquet(snapshot_path, filters=filters).drop(columns="Month")
+    return manifest["files"], df
+
+
+# Load the snapshot plus any JSON files added or changed after it was written
+def fetch_data_from_snapshot(main_folder_path, mode=settings.LOADER_MODE, snapshot_path=settings.SNAPSHOT_DIR):
+    previous_files, previous_df = read_snapshot(main_folder_path, snapshot_path)
+    entries = scan_recording_files(main_folder_path)
+    return merge_changed_recordings(entries, previous_files, previous_df, mode=mode)
+
+
+# A JSON Lines export of the whole collection rather than a tree of recording files
+def is_jsonl_export(main_folder_path):
+    return os.path.isfile(main_folder_path) and main_folder_path.endswith((".jsonl", ".json"))
+
+
+# Decode one chunk of JSON Lines into a frame; the pyarrow decoder parses the whole chunk at once
+def _decode_jsonl_chunk(lines, first_line, path, decoder):
+    if decoder == "pyarrow":
+        try:
+            return pa_json.read_json(io.BytesIO(b"".join(lines))).to_pandas()
+        except pa.ArrowInvalid:
+            # A broken line or a field whose type changes; decode line by line to report it
+            decoder = resolve_decoder("auto")
+    loads = orjson.loads if decoder == "orjson" else json.loads
+    records = []
+    for number, line in enumerate(lines, start=first_line):
+        if not line.strip():
+            continue
+        try:
+            records.append(loads(line))
+        except json.JSONDecodeError:
+            st.warning(f"Could not decode JSON on line {number} of {path}.")
+    return pd.DataFrame(records)
+
+
+# Mongo ObjectId of every row ("_id": {"$oid": ...}); None where a row has none
+def recording_oids(df):
+    if "_id" not in df.columns:
+        return pd.Series(None, index=df.index, dtype="object")
+    return df["_id"].map(lambda value: value.get("$oid") if isinstance(value, dict) else None)
+
+
+# Epoch milliseconds in the recording_<ms>.json file name (or "recording <ms>.txt" in exports)
+def recording_timestamps(df):
+    if "Filename" not in df.columns:
+        return pd.Series(pd.NA, index=df.index, dtype="Int64")
+    digits = df["Filename"].astype(str).str.extract(RECORDING_TIMESTAMP.pattern, expand=False)
+    return pd.to_numeric(digits, errors="coerce").astype("Int64")
+
+
+# Dedup key of every row under a DEDUP_POLICY; None where the row cannot be keyed
+def dedup_keys(df, policy=settings.DEDUP_POLICY):
+    if policy == "off" or df.empty:
+        return pd.Series(None, index=df.index, dtype="object")
+    keys = recording_oids(df)
+    if policy == "id+timestamp":
+        keys = keys + "@" + recording_timestamps(df).astype("string").astype("object")
+    return keys.where(keys.notna(), None)
+
+
+# Flag every copy of a recording but one in a "Duplicate" column. The copy kept is the one
+# with the lowest (Folder, Filename), whatever order the files were read in, so a tree
+# always counts the same copy. Copies stay in the frame: every folder keeps its own rows for
+# People and the report, and unique_recordings leaves the flagged ones out of corpus-wide KPIs.
+# Returns the frame and the number of copies flagged.
+def mark_duplicate_recordings(df, policy=settings.DEDUP_POLICY):
+    if df.empty:
+        df["Duplicate"] = pd.Series(dtype="bool")
+        return df, 0
+    keys = dedup_keys(df, policy).to_numpy()
+    names = pd.DataFrame(
+        {col: df[col].astype(str).to_numpy() if col in df.columns else np.full(len(df), "") for col in ("Folder", "Filename")}
+    )
+    order = names.sort_values(["Folder", "Filename"], kind="stable").index.to_numpy()
+    ranked = pd.Series(keys[order])
+    duplicate = np.zeros(len(df), dtype="bool")
+    duplicate[order] = (ranked.notna() & ranked.duplicated()).to_numpy()
+    df["Duplicate"] = duplicate
+    return df, int(duplicate.sum())
+
+
+# One row per recording: the frame without the copies flagged by mark_duplicate_recordings
+def unique_recordings(df):
+    if "Duplicate" not in df.columns or not df["Duplicate"].any():
+        return df
+    return df[~df["Duplicate"]]
+
+
+# Stream a JSON Lines export (mongoexport output) chunk by chunk. Every chunk is given its
+# Folder from folder_field and a Filename where it has none, shrunk by apply_schema and cut
+# to date_range before the next one is read, so only one chunk of raw records is in memory
+# at a time. Copies of a recording are flagged under the dedup policy once every chunk is in.
+# Returns the frame, the number of lines parsed and the number of duplicate copies flagged.
+def fetch_data_from_jsonl(
+    path,
+    folder_field=settings.JSONL_FOLDER_FIELD,
+    chunk_rows=settings.JSONL_CHUNK_ROWS,
+    decoder=settings.JSON_DECODER,
+    policy=settings.DEDUP_POLICY,
+    date_range=None,
+):
+    decoder = resolve_decoder(decoder)
+    frames = []
+    parsed = 0
+
+    def flush(lines, first_line):
+        nonlocal parsed
+        chunk = _decode_jsonl_chunk(lines, first_line, path, decoder).reset_index(drop=True)
+        if chunk.empty:
+            return
+        if folder_field != "Folder":
+            chunk = chunk.drop(columns="Folder", errors="ignore").rename(columns={folder_field: "Folder"})
+        # Recordings without a folder are grouped together rather than hidden from People
+        chunk["Folder"] = chunk["Folder"].fillna("unassigned") if "Folder" in chunk.columns else "unassigned"
+        # Every row needs a Filename: it keys the recording and stands in for a missing Date.
+        # Records exported without one are named after their ObjectId, or their position in
+        # the export when they have none. Date is then filled in by apply_schema.
+        if "Filename" not in chunk.columns:
+            chunk["Filename"] = None
+        missing = chunk["Filename"].isna()
+        if missing.any():
+            positions = "record " + pd.Series(range(parsed + 1, parsed + len(chunk) + 1), index=chunk.index).astype(str)
+            chunk.loc[missing, "Filename"] = recording_oids(chunk).fillna(positions)[missing]
+        parsed += len(chunk)
+        frames.append(filter_by_date(apply_schema(chunk), date_range))
+
+    with open(path, "rb") as file:
+        lines = []
+        first_line = 1
+        for number, line in enumerate(file, start=1):
+            lines.append(line)
+            if len(lines) == chunk_rows:
+                flush(lines, first_line)
+                lines, first_line = [], number + 1
+        if lines:
+            flush(lines, first_line)
+    df, duplicates = mark_duplicate_recordings(concat_recordings(frames), policy)
+    return df, parsed, duplicates
+
+
+# Load only the recordings with a call Date within date_range. Files are pruned by the
+# timestamp in their name before they are opened. The rows of unchanged files come from the
+# ingest cache, cut to the range first, or else from the Month partitions of the snapshot
+# around it, so only new or changed files within the window are parsed. The ingest cache
+# holds the whole tree and is left as it is; the next all-time load brings it up to date.
+def fetch_data_in_range(
+    main_folder_path,
+    date_range,
+    mode=settings.LOADER_MODE,
+    use_cache=settings.INGEST_CACHE,
+    snapshot_path=settings.SNAPSHOT_DIR,
+):
+    entries = scan_recording_files(main_folder_path, date_range)
+    previous_files, previous_df = _read_ingest_cache(ingest_cache_path(main_folder_path)) if use_cache else ({}, None)
+    if previous_df is not None:
+        # Rows dated outside the range are dropped from the result anyway; dropping them
+        # first keeps the merge to the window. Only the scanned entries are looked up in the
+        # manifest, so it needs no cutting.
+        previous_df = filter_by_date(previous_df, date_range)
+    else:
+        previous_files, previous_df = read_snapshot(main_folder_path, snapshot_path, date_range)
+    df, parsed = merge_changed_recordings(entries, previous_files, previous_df, mode=mode)
+    return filter_by_date(df, date_range), parsed
+
+
+# Load the recordings with the configured loader and report how fast it went
+def load_recordings(main_folder_path, mode=settings.LOADER_MODE, use_cache=settings.INGEST_CACHE, date_range=None):
+    start = time.perf_counter()
+    decoder = resolve_decoder()
+    if is_jsonl_export(main_folder_path):
+        mode = "jsonl"
+        try:
+            df, parsed, duplicates = fetch_data_from_jsonl(main_folder_path, date_range=date_range)
+        except Exception as e:
+            st.error(f"Error fetching data: {e}")
+            df, parsed, duplicates = pd.DataFrame(), 0, 0
+    elif date_range is not None:
+        try:
+            df, parsed = fetch_data_in_range(main_folder_path, date_range, mode=mode, use_cache=use_cache)
+        except Exception as e:
+            st.error(f"Error fetching data: {e}")
+            df, parsed = pd.DataFrame(), 0
+    elif use_cache:
+        try:
+            df, parsed = fetch_data_incremental(main_folder_path, mode=mode)
+        except Exception as e:
+            st.error(f"Error fetching data: {e}")
+            df, parsed = pd.DataFrame(), 0
+    elif os.path.exists(os.path.join(settings.SNAPSHOT_DIR, SNAPSHOT_MANIFEST)):
+        try:
+            df, parsed = fetch_data_from_snapshot(main_folder_path, mode=mode)
+        except Exception as e:
+            st.error(f"Error fetching data: {e}")
+            df, parsed = pd.DataFrame(), 0
+    elif mode == "parallel":
+        df = apply_schema(fetch_data_parallel(main_folder_path))
+        parsed = len(df)
+    else:
+        df = apply_schema(fetch_data_from_nested_folders(main_folder_path))
+        parsed = len(df)
+        decoder = "stdlib"
+
+    # JSON Lines exports flag their copies as they are read. Other frames are flagged here
+    # rather than in the ingest cache, so removing the kept copy of a recording makes the
+    # next one count on the following load.
+    if mode != "jsonl":
+        df, duplicates = mark_duplicate_recordings(df)
+    seconds = time.perf_counter() - start
+
+    files = len(df)
+    date_fallbacks = int(df["Date from filename"].sum()) if "Date from filename" in df.columns else 0
+    load_stats = {
+        "mode": mode,
+        "decoder": decoder,
+        "loaded_at": datetime.now(),
+        "files": files,
+        "parsed": parsed,
+        "duplicates": duplicates,
+        "date_range": date_range,
+        "date_fallbacks": date_fallbacks,
+        "seconds": seconds,
+        "files_per_sec": files / seconds if seconds > 0 else 0.0,
+    }
+    return df, load_stats
+
+
+# Identifies one materialized frame; a refresh reloads under the same fingerprint but a new version
+def data_version(load_stats):
+    version = f"{load_stats['fingerprint']}@{load_stats['loaded_at']:%Y%m%d%H%M%S%f}"
+    if load_stats.get("date_range"):
+        start, end = load_stats["date_range"]
+        version += f"[{start:%Y%m%d}-{end:%Y%m%d}]"
+    return version
+
+
+# Fingerprint of the data tree: the (size, mtime) of every recording, as in the ingest
+# manifest. Folder mtimes alone would miss a recording rewritten in place.
+def data_fingerprint(main_folder_path):
+    digest = hashlib.sha1()
+    try:
+        if is_jsonl_export(main_folder_path):
+            stat = os.stat(main_folder_path)
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+            return digest.hexdigest()[:12]
+        for folder_name, filename, _, size, mtime in sorted(scan_recording_files(main_folder_path)):
+            digest.update(f"{folder_name}/{filename}:{size}:{mtime};".encode())
+    except OSError:
+        return "unavailable"
+    return digest.hexdigest()[:12]
+
+
+# data_fingerprint shared by all sessions. Stat'ing every recording is not free, so the tree
+# is checked at most every FINGERPRINT_TTL seconds rather than on every rerun.
+@st.cache_data(ttl=settings.FINGERPRINT_TTL, show_spinner=False)
+def current_fingerprint(main_folder_path):
+    return data_fingerprint(main_folder_path)
+
+
+# Rows of an in-memory corpus within date_range, shared by the sessions viewing that range
+@st.cache_resource(max_entries=4, show_spinner=False)
+def filter_shared_recordings(version, _df, _load_stats, date_range):
+    df = filter_by_date(_df, date_range)
+    date_fallbacks = int(df["Date from filename"].sum()) if "Date from filename" in df.columns else 0
+    duplicates = int(df["Duplicate"].sum()) if "Duplicate" in df.columns else 0
+    return df, dict(
+        _load_stats, files=len(df), duplicates=duplicates, date_range=date_range, date_fallbacks=date_fallbacks
+    )
+
+
+# One copy of the corpus per server process and date range, shared read-only by every
+# session. Only the last few (fingerprint, range) loads are kept in memory.
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_shared_recordings(main_folder_path, fingerprint, date_range=None):
+    df, load_stats = load_recordings(main_folder_path, date_range=date_range)
+    load_stats["fingerprint"] = fingerprint
+    return df, load_stats
@@ -0,0 +1,22 @@
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Person-specific figures, shared by the People section of the dashboard and report.py
+
+
+# Bar chart of one folder's average scores (a Series indexed by score name)
+def average_scores_figure(average_scores):
+    fig = go.Figure(data=[go.Bar(x=average_scores.index, y=average_scores.values)])
+    fig.update_layout(title="Average Scores")
+    return fig
+
+
+# Sentiment Analysis Score of one folder's recordings by call date. Rows come in file order,
+# so they are sorted by Date here for the line to run left to right.
+def sentiment_over_time_figure(folder_data):
+    return px.line(
+        folder_data.sort_values("Date", kind="stable"),
+        x="Date",
+        y="Sentiment Analysis Score",
+        title="Sentiment Analysis Over Time",
+    )
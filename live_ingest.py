@@ -0,0 +1,287 @@
+import logging
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+import settings
+from aggregates import build_kpi_cube, merge_kpi_cubes
+from data_loader import (
+    apply_schema,
+    concat_recordings,
+    dedup_keys,
+    is_jsonl_export,
+    load_recordings,
+    read_recording,
+    recording_keys,
+    unique_recordings,
+)
+from search_index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+# A file that still fails to parse after this many batches is reported and dropped
+MAX_PARSE_ATTEMPTS = 5
+
+
+# Collects recording_*.json files created, modified, moved in or deleted under data/<folder>/
+class RecordingEventHandler(FileSystemEventHandler):
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    def _is_recording(self, path):
+        folder_path, filename = os.path.split(path)
+        return (
+            filename.startswith("recording_")
+            and filename.endswith(".json")
+            and os.path.dirname(folder_path) == self.corpus.main_folder_path
+        )
+
+    # A person folder directly under data/
+    def _is_folder(self, path):
+        return os.path.dirname(path) == self.corpus.main_folder_path
+
+    def on_created(self, event):
+        if event.is_directory:
+            if self._is_folder(event.src_path):
+                self.corpus.queue_changed_folder(event.src_path)
+        elif self._is_recording(event.src_path):
+            self.corpus.queue_changed(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory and self._is_recording(event.src_path):
+            self.corpus.queue_changed(event.src_path)
+
+    # A whole person folder moved out of data/ arrives as a single directory event, with no
+    # event for the files inside it
+    def on_moved(self, event):
+        if event.is_directory:
+            if self._is_folder(event.src_path):
+                self.corpus.queue_deleted_folder(event.src_path)
+            if self._is_folder(event.dest_path):
+                self.corpus.queue_changed_folder(event.dest_path)
+            return
+        if self._is_recording(event.src_path):
+            self.corpus.queue_deleted(event.src_path)
+        if self._is_recording(event.dest_path):
+            self.corpus.queue_changed(event.dest_path)
+
+    def on_deleted(self, event):
+        if event.is_directory:
+            if self._is_folder(event.src_path):
+                self.corpus.queue_deleted_folder(event.src_path)
+        elif self._is_recording(event.src_path):
+            self.corpus.queue_deleted(event.src_path)
+
+
+# In-memory corpus kept up to date by a file watcher. Each batch of new files builds a new
+# frame and swaps it in, so sessions holding the previous frame keep a consistent view.
+# The KPI cube and the search index are updated from the changed rows only. An index of the
+# copies of every recording flags all but one of them as duplicates, so the cube counts each
+# recording once while every folder keeps its own rows.
+class LiveCorpus:
+    def __init__(self, main_folder_path, interval=settings.LIVE_INGEST_INTERVAL):
+        self.main_folder_path = os.path.abspath(main_folder_path)
+        self.interval = interval
+        self.version = 0
+        self._pending = {}
+        self._deleted = set()
+        self._deleted_folders = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        # Watch before the initial load, so files written while it runs are queued rather than
+        # missed. Files the load already picked up are parsed again; that only replaces rows.
+        self._observer = Observer()
+        self._observer.schedule(RecordingEventHandler(self), self.main_folder_path, recursive=True)
+        self._observer.daemon = True
+        self._observer.start()
+
+        df, load_stats = load_recordings(main_folder_path)
+        load_stats["fingerprint"] = "live-0"
+        self._state = (df, load_stats, build_kpi_cube(unique_recordings(df)))
+        # dedup key -> (folder, filename) of every copy of that recording in the corpus
+        self._copies = {}
+        for key, folder, filename in _copies_of(df):
+            self._copies.setdefault(key, set()).add((folder, filename))
+        # Built by the worker before it applies any change, so the first page is not held up
+        self.search_index = SearchIndex()
+
+        self._worker = threading.Thread(target=self._run, name="live-ingest", daemon=True)
+        self._worker.start()
+
+    # (frame, load_stats, KPI cube) of the latest version, read in one go so they always match
+    def current(self):
+        return self._state
+
+    def queue_changed(self, path):
+        with self._lock:
+            self._deleted.discard(path)
+            self._pending.setdefault(path, 0)
+
+    def queue_changed_folder(self, folder_path):
+        try:
+            filenames = [
+                entry.name
+                for entry in os.scandir(folder_path)
+                if entry.name.startswith("recording_") and entry.name.endswith(".json")
+            ]
+        except OSError:
+            return
+        for filename in filenames:
+            self.queue_changed(os.path.join(folder_path, filename))
+
+    # Every row of the folder is dropped by the next batch, whatever it holds by then; files
+    # queued for the folder before it went away are no longer there to read
+    def queue_deleted_folder(self, folder_path):
+        with self._lock:
+            for path in [path for path in self._pending if os.path.dirname(path) == folder_path]:
+                del self._pending[path]
+            self._deleted_folders.add(os.path.basename(folder_path))
+
+    def queue_deleted(self, path):
+        with self._lock:
+            self._pending.pop(path, None)
+            self._deleted.add(path)
+
+    def stop(self):
+        self._stop.set()
+        self._observer.stop()
+
+    def _run(self):
+        try:
+            self.search_index.build(self._state[0])
+        except Exception:
+            logger.exception("Building the search index failed")
+        # Batch events so a burst of files produces one new frame rather than one per file
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                deleted, self._deleted = self._deleted, set()
+                deleted_folders, self._deleted_folders = self._deleted_folders, set()
+            if pending or deleted or deleted_folders:
+                try:
+                    self._apply(pending, deleted, deleted_folders)
+                except Exception:
+                    logger.exception("Live ingestion of %d files failed", len(pending))
+
+    def _apply(self, pending, deleted, deleted_folders=()):
+        records = []
+        retry = {}
+        for path, attempts in pending.items():
+            folder_path, filename = os.path.split(path)
+            try:
+                data = read_recording((os.path.basename(folder_path), filename, path))
+            except OSError:
+                # Deleted or moved again before we got to it
+                continue
+            if data is not None:
+                records.append(data)
+            elif attempts + 1 < MAX_PARSE_ATTEMPTS:
+                # Most likely still being written; retry with the next batch
+                retry[path] = attempts + 1
+            else:
+                logger.warning("Could not decode JSON from %s.", path)
+        with self._lock:
+            for path, attempts in retry.items():
+                self._pending.setdefault(path, attempts)
+
+        df, load_stats, cube = self._state
+        # Changed files replace their previous rows; deleted files and folders just drop out
+        replaced = {
+            f"{os.path.basename(os.path.dirname(path))}/{os.path.basename(path)}"
+            for path in [*deleted, *(path for path in pending if path not in retry)]
+        }
+        if df.empty:
+            is_replaced = pd.Series(dtype="bool")
+        else:
+            is_replaced = recording_keys(df).isin(replaced)
+            if deleted_folders:
+                is_replaced |= df["Folder"].astype(str).isin(deleted_folders)
+        removed, kept = df[is_replaced], df[~is_replaced]
+        new_rows = apply_schema(pd.DataFrame(records))
+        if not new_rows.empty:
+            new_rows["Duplicate"] = False
+
+        # Update the copies of every recording the batch touches, then re-pick the counted copy
+        # of each: the one with the lowest (Folder, Filename), as in mark_duplicate_recordings
+        touched = set()
+        for key, folder, filename in _copies_of(removed):
+            copies = self._copies.get(key, set())
+            copies.discard((folder, filename))
+            if not copies:
+                self._copies.pop(key, None)
+            touched.add(key)
+        for key, folder, filename in _copies_of(new_rows):
+            self._copies.setdefault(key, set()).add((folder, filename))
+            touched.add(key)
+
+        new_df = concat_recordings([kept, new_rows])
+        # Rows counted in the cube before this batch; new rows were not
+        was_counted = np.concatenate([_counted(kept), np.zeros(len(new_rows), dtype="bool")])
+        if touched and not new_df.empty:
+            is_duplicate = {}
+            for key in touched:
+                copies = self._copies.get(key)
+                if copies:
+                    first = min(copies)
+                    is_duplicate.update({f"{folder}/{filename}": (folder, filename) != first for folder, filename in copies})
+            keys = recording_keys(new_df)
+            affected = keys.isin(is_duplicate.keys())
+            new_df.loc[affected, "Duplicate"] = keys[affected].map(is_duplicate).astype("bool")
+        is_counted = _counted(new_df)
+
+        self.search_index.remove(replaced | (set(recording_keys(removed)) if not removed.empty else set()))
+        self.search_index.add(new_rows)
+
+        # The cube counts each recording once: take out the rows it no longer counts (replaced,
+        # deleted or now a duplicate copy) and add the ones it now counts
+        cube = merge_kpi_cubes(cube, build_kpi_cube(removed[_counted(removed)]), sign=-1)
+        if not new_df.empty:
+            cube = merge_kpi_cubes(cube, build_kpi_cube(new_df[was_counted & ~is_counted]), sign=-1)
+            cube = merge_kpi_cubes(cube, build_kpi_cube(new_df[~was_counted & is_counted]))
+
+        self.version += 1
+        new_stats = dict(
+            load_stats,
+            files=len(new_df),
+            parsed=len(records),
+            duplicates=int((~is_counted).sum()),
+            date_fallbacks=int(new_df["Date from filename"].sum()) if "Date from filename" in new_df.columns else 0,
+            loaded_at=datetime.now(),
+            fingerprint=f"live-{self.version}",
+        )
+        self._state = (new_df, new_stats, cube)
+        logger.info("Live ingestion added %d recordings (version %d)", len(records), self.version)
+
+
+# Rows counted by corpus-wide KPIs, i.e. not flagged as a duplicate copy
+def _counted(df):
+    if "Duplicate" not in df.columns:
+        return np.ones(len(df), dtype="bool")
+    return ~df["Duplicate"].to_numpy(dtype="bool")
+
+
+# (dedup key, folder, filename) of every row that has a dedup key
+def _copies_of(df):
+    if df.empty:
+        return []
+    keys = dedup_keys(df)
+    has_key = keys.notna()
+    return list(zip(keys[has_key], df.loc[has_key, "Folder"].astype(str), df.loc[has_key, "Filename"]))
+
+
+# Live ingestion watches a folder tree; a JSON Lines export is reloaded on refresh instead
+def uses_live_ingest(main_folder_path):
+    return settings.LIVE_INGEST and not is_jsonl_export(main_folder_path)
+
+
+# One live corpus per server process, shared by all sessions
+@st.cache_resource(show_spinner=False)
+def get_live_corpus(main_folder_path):
+    return LiveCorpus(main_folder_path)
@@ -0,0 +1,109 @@
+import functools
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import settings
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# One JSON line per script run goes to this logger when profiling is on
+logger = logging.getLogger("dashboard.perf")
+if not logger.handlers:
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+# Reset the stage timings at the top of every full script run
+def start_run():
+    st.session_state["perf_stages"] = []
+    st.session_state["perf_run_start"] = time.perf_counter()
+    if settings.PROFILE:
+        # Peak memory is process-wide, so concurrent sessions show up in each other's peaks
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+
+# True during a rerun of fragments only, which has no start_run or finish_run
+def _fragment_rerun():
+    ctx = get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run)
+
+
+# Time a stage of the run. Timings are cheap and always recorded; the last duration of
+# every stage is kept in session_state["perf_last_ms"] so fragment reruns can be compared.
+# The per-run list is only kept for full runs: nothing reports it after a fragment rerun,
+# and a fragment on a timer would grow it for as long as the page stays open.
+@contextmanager
+def stage(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        if not _fragment_rerun():
+            st.session_state.setdefault("perf_stages", []).append({"stage": name, "ms": ms})
+        st.session_state.setdefault("perf_last_ms", {})[name] = ms
+
+
+# Decorator form of stage, for whole sections and fragments
+def timed(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# st.plotly_chart, timed as its own stage
+def plotly_chart(name, fig):
+    with stage(f"{name}: st.plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+# Show the breakdown of this run in the sidebar and log it as one JSON line
+def finish_run(section, load_stats):
+    if not settings.PROFILE:
+        return
+    stages = st.session_state.get("perf_stages", [])
+    record = {
+        "event": "dashboard_run",
+        "section": section,
+        "total_ms": round((time.perf_counter() - st.session_state["perf_run_start"]) * 1000, 2),
+        "peak_traced_mb": round(tracemalloc.get_traced_memory()[1] / 2**20, 2),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2) if resource else None,
+        "data_version": load_stats.get("fingerprint"),
+        "last_load_seconds": round(load_stats["seconds"], 4),
+        "date_fallbacks": load_stats["date_fallbacks"],
+        "stages": [{"stage": item["stage"], "ms": round(item["ms"], 2)} for item in stages],
+    }
+    logger.info(json.dumps(record))
+
+    with st.sidebar.expander("Performance", expanded=True):
+        st.caption(
+            f"Run: {record['total_ms']:.0f} ms · peak traced {record['peak_traced_mb']:.1f} MB"
+            + (f" · max RSS {record['max_rss_mb']:.0f} MB" if record["max_rss_mb"] is not None else "")
+        )
+        st.caption(
+            f"Last corpus load: {load_stats['seconds']:.2f}s for {load_stats['files']} files "
+            f"({load_stats['parsed']} parsed)"
+        )
+        st.caption(f"Dates taken from file names: {record['date_fallbacks']}")
+        st.dataframe(record["stages"], hide_index=True, use_container_width=True)
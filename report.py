@@ -0,0 +1,137 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import settings
+from aggregates import FolderIndex
+from data_loader import SCORE_COLUMNS, load_recordings, recording_oids
+
+# Per-folder KPIs and the People figures for every folder, written as static files:
+#   python report.py --data data --out reports --days 7
+# Folders are rendered in parallel across processes. A folder whose recordings did not change
+# since the last run into the same --out is skipped; pass --force to render everything.
+
+STATE_FILE = "_report_state.json"
+
+
+# Content hash of each folder's recordings, to tell which folders changed since the last run.
+# Whether a row is the counted copy of its recording does not change the folder's files.
+def folder_fingerprints(df, index):
+    hashable = df.drop(columns=["_id", "Duplicate"], errors="ignore")
+    if "_id" in df.columns:
+        hashable = hashable.assign(_id=recording_oids(df))
+    row_hashes = pd.util.hash_pandas_object(hashable, index=False)
+    return {
+        str(folder): f"{int(row_hashes.take(positions).sum()) % 2**64:016x}"
+        for folder, positions in index.positions.items()
+    }
+
+
+def folder_kpis(folder, rows, means):
+    dates = rows["Date"].dropna()
+    return {
+        "folder": folder,
+        "recordings": len(rows),
+        "first_call": f"{dates.min():%Y-%m-%d}" if not dates.empty else None,
+        "last_call": f"{dates.max():%Y-%m-%d}" if not dates.empty else None,
+        **{col: None if pd.isna(means.get(col)) else round(float(means[col]), 3) for col in SCORE_COLUMNS},
+    }
+
+
+# Runs in a worker process: KPIs and figures of one folder
+def render_folder(task):
+    from figures import average_scores_figure, sentiment_over_time_figure
+
+    folder, rows, means, out_dir, fmt = task
+    folder_dir = os.path.join(out_dir, folder)
+    os.makedirs(folder_dir, exist_ok=True)
+    kpis = folder_kpis(folder, rows, means)
+    with open(os.path.join(folder_dir, "kpis.json"), "w") as file:
+        json.dump(kpis, file, indent=2)
+
+    figures = {
+        "average_scores": average_scores_figure(means.reindex(SCORE_COLUMNS)),
+        "sentiment_over_time": sentiment_over_time_figure(rows),
+    }
+    for name, fig in figures.items():
+        path = os.path.join(folder_dir, f"{name}.{fmt}")
+        if fmt == "html":
+            # The plotly.js bundle is loaded from the CDN rather than embedded in every file
+            fig.write_html(path, include_plotlyjs="cdn")
+        else:
+            fig.write_image(path)
+    return kpis
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write per-folder KPIs and figures for every folder.")
+    parser.add_argument("--data", default=settings.DATA_DIR, help="data folder or JSON Lines export")
+    parser.add_argument("--out", default="reports", help="output directory")
+    parser.add_argument("--days", type=int, help="only calls from the last N days (default: all time)")
+    parser.add_argument("--format", choices=["html", "png", "svg"], default="html",
+                        help="figure format; png and svg need the kaleido package")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--force", action="store_true", help="render folders even if unchanged")
+    args = parser.parse_args()
+
+    if args.format != "html":
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            parser.error(f"--format {args.format} needs the kaleido package; use --format html")
+
+    start = time.perf_counter()
+    date_range = None
+    if args.days:
+        today = datetime.now().date()
+        date_range = (today - timedelta(days=args.days - 1), today)
+    df, load_stats = load_recordings(args.data, date_range=date_range)
+    print(f"Loaded {len(df)} recordings in {load_stats['seconds']:.2f}s")
+    if df.empty:
+        print("No recordings to report on")
+        return
+
+    index = FolderIndex(df)
+    fingerprints = folder_fingerprints(df, index)
+    os.makedirs(args.out, exist_ok=True)
+    state_path = os.path.join(args.out, STATE_FILE)
+    previous = {}
+    if not args.force and os.path.exists(state_path):
+        with open(state_path, "r") as file:
+            state = json.load(file)
+        # A different period or format makes every previous file stale
+        if state.get("days") == args.days and state.get("format") == args.format:
+            previous = state["folders"]
+
+    changed = [folder for folder in index.folders if previous.get(str(folder)) != fingerprints[str(folder)]]
+    tasks = (
+        (str(folder), index.rows(folder), index.score_means.loc[folder], args.out, args.format)
+        for folder in changed
+    )
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for done, _ in enumerate(executor.map(render_folder, tasks, chunksize=16), start=1):
+            if done % 500 == 0:
+                print(f"  rendered {done}/{len(changed)} folders")
+
+    # The summary table covers every folder, rendered this run or not
+    counts = pd.Series(index.positions).map(len)
+    summary = index.score_means.reindex(columns=SCORE_COLUMNS).round(3)
+    summary.insert(0, "recordings", counts.reindex(summary.index))
+    summary.to_csv(os.path.join(args.out, "kpis.csv"), index_label="folder")
+
+    with open(state_path + ".tmp", "w") as file:
+        json.dump({"days": args.days, "format": args.format, "folders": fingerprints}, file)
+    os.replace(state_path + ".tmp", state_path)
+    print(
+        f"Rendered {len(changed)} folders, skipped {len(index.folders) - len(changed)} unchanged, "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import html
+import re
+import threading
+from array import array
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import recording_keys
+
+# Free-text columns covered by the search index
+TEXT_COLUMNS = ["Summary", "Feedback for improvement"]
+
+TOKEN = re.compile(r"\w+")
+
+# Words too common in call summaries to narrow a search; left out of the index and of queries
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "had", "has", "he", "her",
+    "his", "in", "is", "it", "of", "on", "or", "she", "that", "the", "their", "they", "this",
+    "to", "was", "were", "with",
+}
+
+
+def tokenize(text):
+    return {token for token in TOKEN.findall(text.lower()) if token not in STOP_WORDS}
+
+
+# Inverted index from token to the recordings whose Summary or Feedback contains it.
+# Postings are arrays of increasing doc ids (4 bytes each), so a query is an intersection
+# of sorted arrays rather than a scan over the text. Recordings are identified by their
+# "<folder>/<filename>" key, which survives the frame being rebuilt; a changed recording is
+# re-added under a new doc id and its old one is skipped.
+class SearchIndex:
+    def __init__(self):
+        self.ready = False
+        self._postings = {}
+        self._keys = []
+        self._doc_ids = {}
+        self._deleted = set()
+        self._lock = threading.Lock()
+
+    def build(self, df):
+        self.add(df)
+        self.ready = True
+
+    def add(self, df):
+        if df.empty:
+            return
+        columns = [df[col].fillna("").astype(str) for col in TEXT_COLUMNS if col in df.columns]
+        if not columns:
+            return
+        with self._lock:
+            for key, *texts in zip(recording_keys(df), *columns):
+                if key in self._doc_ids:
+                    self._deleted.add(self._doc_ids[key])
+                doc_id = len(self._keys)
+                self._keys.append(key)
+                self._doc_ids[key] = doc_id
+                for token in tokenize(" ".join(texts)):
+                    postings = self._postings.get(token)
+                    if postings is None:
+                        postings = self._postings[token] = array("I")
+                    postings.append(doc_id)
+
+    def remove(self, keys):
+        with self._lock:
+            for key in keys:
+                doc_id = self._doc_ids.pop(key, None)
+                if doc_id is not None:
+                    self._deleted.add(doc_id)
+
+    # Keys of the recordings containing every word of the query, most recently added first.
+    # Insertion order follows the file scan and cache merges, not the call Date.
+    def search(self, query):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self._lock:
+            postings = [self._postings.get(token) for token in tokens]
+            if any(posting is None for posting in postings):
+                return []
+            # Copies, so later appends never resize an array numpy is looking at
+            postings = sorted((np.array(posting, dtype=np.uint32) for posting in postings), key=len)
+            deleted = np.fromiter(self._deleted, dtype=np.uint32, count=len(self._deleted))
+            keys = self._keys
+        doc_ids = postings[0]
+        for posting in postings[1:]:
+            doc_ids = np.intersect1d(doc_ids, posting, assume_unique=True)
+        if len(deleted):
+            doc_ids = doc_ids[~np.isin(doc_ids, deleted)]
+        return [keys[doc_id] for doc_id in doc_ids[::-1]]
+
+
+# Punctuation that st.markdown would turn into formatting, LaTeX ($) or emoji shortcodes (:);
+# &, < and > are left to html.escape
+MARKDOWN_SPECIAL = re.compile(r"([\\`*_{}\[\]()#+\-.!|~$:])")
+
+
+# Text for st.markdown(..., unsafe_allow_html=True) that shows exactly as written: markdown
+# syntax is backslash-escaped and HTML special characters become entities
+def escape_markdown(text):
+    return html.escape(MARKDOWN_SPECIAL.sub(r"\\\1", str(text)), quote=False)
+
+
+# Up to width characters of text around the first query word, with the words in bold. The
+# text is escaped with escape_markdown, so only the <b> tags are markup.
+def snippet(text, query, width=160):
+    if not isinstance(text, str):
+        return None
+    tokens = tokenize(query)
+    pattern = re.compile(r"\b(" + "|".join(re.escape(token) for token in tokens) + r")\b", re.IGNORECASE)
+    match = pattern.search(text) if tokens else None
+    if match is None:
+        return None
+    start = max(0, match.start() - width // 2)
+    excerpt = text[start : start + width]
+    parts, end = [], 0
+    for found in pattern.finditer(excerpt):
+        parts += [escape_markdown(excerpt[end : found.start()]), f"<b>{escape_markdown(found.group(0))}</b>"]
+        end = found.end()
+    parts.append(escape_markdown(excerpt[end:]))
+    return ("…" if start > 0 else "") + "".join(parts) + ("…" if start + width < len(text) else "")
+
+
+# Search index of a loaded corpus, built once per data version and shared by all sessions
+@st.cache_resource(max_entries=4, show_spinner=False)
+def shared_search_index(version, _df):
+    index = SearchIndex()
+    index.build(_df)
+    return index
+
+
+# Position of every recording key in a loaded frame, to turn search results into rows. Keys
+# repeat when a JSON Lines export holds copies of a recording under the same file name.
+@st.cache_resource(max_entries=4, show_spinner=False)
+def recording_positions(version, _df):
+    return pd.Index(recording_keys(_df))
@@ -0,0 +1,34 @@
+import os
+import sys
+import threading
+
+from streamlit.web import cli
+
+import settings
+
+# Starts the dashboard with the corpus already loading, in place of `streamlit run dashboard.py`:
+#   python serve.py --server.port 8501
+# Arguments are passed on to `streamlit run`. The corpus is loaded in this process, so the
+# sessions of the server find it in the shared cache; set DASHBOARD_PREFETCH=0 to load on the
+# first session instead.
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# The loader modules are imported on the prefetch thread too, so the server comes up without
+# waiting for pandas
+def prefetch():
+    import warmup
+
+    warmup.prefetch(settings.DATA_DIR)
+
+
+def main():
+    if settings.PREFETCH:
+        threading.Thread(target=prefetch, name="prefetch", daemon=True).start()
+    sys.argv = ["streamlit", "run", os.path.join(REPO_DIR, "dashboard.py"), *sys.argv[1:]]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import os
+
+# Dashboard settings, overridable through environment variables
+
+# Folder holding one sub-folder of recording_*.json files per person, or a single JSON Lines
+# export of the whole collection (mongoexport output, one recording per line)
+DATA_DIR = os.environ.get("DASHBOARD_DATA_DIR", "data")
+
+# JSON Lines exports: field holding the person folder, and lines decoded per chunk
+JSONL_FOLDER_FIELD = os.environ.get("DASHBOARD_JSONL_FOLDER_FIELD", "Folder")
+JSONL_CHUNK_ROWS = int(os.environ.get("DASHBOARD_JSONL_CHUNK_ROWS", "50000"))
+
+# Loader mode: "serial" reads files one by one, "parallel" uses a thread pool
+LOADER_MODE = os.environ.get("DASHBOARD_LOADER_MODE", "parallel")
+LOADER_WORKERS = int(os.environ.get("DASHBOARD_LOADER_WORKERS", "8"))
+
+# JSON decoder: "stdlib", "orjson", "pyarrow" (whole batches straight into Arrow columns) or
+# "auto" for orjson when it is installed. Decoders that are not installed fall back to "auto".
+JSON_DECODER = os.environ.get("DASHBOARD_JSON_DECODER", "auto")
+
+# Incremental ingestion: only new or changed files are parsed, the rest comes from CACHE_DIR
+INGEST_CACHE = os.environ.get("DASHBOARD_INGEST_CACHE", "1") == "1"
+CACHE_DIR = os.environ.get("DASHBOARD_CACHE_DIR", ".dashboard_cache")
+
+# Recordings exported more than once (the same Mongo _id under several folders) are counted
+# once: "id" keys them on _id.$oid, "id+timestamp" on _id.$oid plus the recording_<ms>
+# timestamp of the file name, "off" keeps every copy. The copy with the lowest (Folder,
+# Filename) is the one counted; the others stay in their folders, flagged as duplicates.
+DEDUP_POLICY = os.environ.get("DASHBOARD_DEDUP", "id")
+
+# Date-range loads skip files whose recording_<ms> timestamp is further than this many days
+# outside the range. A call's Date is usually within a few weeks of its recording timestamp.
+DATE_FILTER_SLACK_DAYS = int(os.environ.get("DASHBOARD_DATE_FILTER_SLACK_DAYS", "31"))
+
+# Without live ingestion, the data tree is re-stat'ed at most every FINGERPRINT_TTL seconds to
+# notice added, removed or rewritten recordings
+FINGERPRINT_TTL = float(os.environ.get("DASHBOARD_FINGERPRINT_TTL", "10"))
+
+# Parquet snapshot written by snapshot.py; used as the base of a load when present
+SNAPSHOT_DIR = os.environ.get("DASHBOARD_SNAPSHOT_DIR", "data_snapshot")
+
+# Live ingestion: a file watcher appends new recordings to the in-memory corpus, and open
+# Overview pages re-read their KPIs every LIVE_REFRESH_SECONDS
+LIVE_INGEST = os.environ.get("DASHBOARD_LIVE_INGEST", "1") == "1"
+LIVE_INGEST_INTERVAL = float(os.environ.get("DASHBOARD_LIVE_INGEST_INTERVAL", "1.0"))
+LIVE_REFRESH_SECONDS = float(os.environ.get("DASHBOARD_LIVE_REFRESH_SECONDS", "10"))
+
+# Most courses the Overview radar chart will draw, one trace each
+RADAR_MAX_COURSES = int(os.environ.get("DASHBOARD_RADAR_MAX_COURSES", "10"))
+
+# Server start: serve.py loads the corpus and builds its caches in the background before any
+# session connects
+PREFETCH = os.environ.get("DASHBOARD_PREFETCH", "1") == "1"
+
+# Profiling: show a sidebar Performance panel, track peak memory and log one JSON line per run
+PROFILE = os.environ.get("DASHBOARD_PROFILE", "0") == "1"
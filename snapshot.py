@@ -0,0 +1,17 @@
+import argparse
+import time
+
+import settings
+from data_loader import write_snapshot
+
+# Compact the data/<folder>/recording_*.json tree into a Parquet snapshot:
+#   python snapshot.py --data data --out data_snapshot
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a Parquet snapshot of the recordings.")
+    parser.add_argument("--data", default=settings.DATA_DIR, help="folder holding the person folders")
+    parser.add_argument("--out", default=settings.SNAPSHOT_DIR, help="snapshot directory")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = write_snapshot(args.data, args.out)
+    print(f"Wrote {rows} recordings to {args.out} in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,55 @@
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Settings are read from the environment on first import: keep the ingest cache and the
+# snapshot out of the working tree
+os.environ.setdefault("DASHBOARD_CACHE_DIR", tempfile.mkdtemp(prefix="dashboard_test_cache_"))
+os.environ.setdefault("DASHBOARD_SNAPSHOT_DIR", os.path.join(tempfile.mkdtemp(prefix="dashboard_test_"), "snapshot"))
+os.environ.setdefault("DASHBOARD_DEDUP", "id")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def recording(oid, date="23-08-2024", score=5, summary="Discussed the course fee"):
+    return {
+        "_id": {"$oid": oid},
+        "BANT Score": str(score),
+        "Call Intent Score": str(score),
+        "SPIN Score": str(score),
+        "Sentiment Analysis Score": str(score),
+        "Detailed Call Score": str(score),
+        "Course Interested": "DevOps",
+        "Lead City": "Pune",
+        "Date": date,
+        "Summary": summary,
+        "Feedback for improvement": "Ask about the budget earlier",
+    }
+
+
+# Write data/<folder>/recording_<ms>.json and return its path
+def write_recording(root, folder, ms, data):
+    os.makedirs(os.path.join(root, folder), exist_ok=True)
+    path = os.path.join(root, folder, f"recording_{ms}.json")
+    with open(path, "w") as file:
+        json.dump(data, file)
+    return path
+
+
+# Bump a file's mtime so the ingest manifest sees it as changed
+def touch(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10**9))
+
+
+# Three folders holding copies of one recording ("shared") plus one recording of their own
+@pytest.fixture
+def data_tree(tmp_path):
+    root = str(tmp_path / "data")
+    for i, folder in enumerate(["b-folder", "a-folder", "c-folder"]):
+        write_recording(root, folder, 1723036302191, recording("shared"))
+        write_recording(root, folder, 1723036302200 + i, recording(f"own-{folder}", score=i + 1))
+    return root
@@ -0,0 +1,93 @@
+import pandas as pd
+import pytest
+
+from aggregates import (
+    FolderIndex,
+    build_kpi_cube,
+    build_score_histograms,
+    filter_kpi_cube,
+    merge_kpi_cubes,
+    summarize_kpi_cube,
+)
+from conftest import recording
+from data_loader import SCORE_COLUMNS, apply_schema
+
+
+# Schema-applied frame of recordings, one per (folder, record) pair
+def recordings_frame(rows):
+    return apply_schema(
+        pd.DataFrame(
+            [
+                {**record, "Folder": folder, "Filename": f"recording_{1723036302191 + i}.json"}
+                for i, (folder, record) in enumerate(rows)
+            ]
+        )
+    )
+
+
+@pytest.fixture
+def recordings():
+    return recordings_frame(
+        [
+            ("a", recording("1", date="23-08-2024", score=2)),
+            ("a", recording("2", date="23-08-2024", score=4)),
+            ("a", {**recording("3", date="24-08-2024", score=9), "SPIN Score": "N/A"}),
+            ("b", {**recording("4", date="24-08-2024", score=7), "Lead City": "Delhi"}),
+        ]
+    )
+
+
+def test_kpi_cube_summarizes_like_the_raw_scores(recordings):
+    cube = build_kpi_cube(recordings)
+    # One row per Folder x Date x Course Interested x Lead City
+    assert len(cube) == 3
+    assert cube["Recordings"].sum() == 4
+
+    summary = summarize_kpi_cube(cube)
+    scores = recordings[SCORE_COLUMNS].astype("float64")
+    pd.testing.assert_series_equal(summary["count"], scores.count().astype("float64"), check_names=False)
+    pd.testing.assert_series_equal(summary["mean"], scores.mean(), check_names=False)
+    pd.testing.assert_series_equal(summary["std"], scores.std(ddof=0), check_names=False)
+
+    start = pd.Timestamp("2024-08-24").date()
+    assert filter_kpi_cube(cube, (start, start))["Recordings"].sum() == 2
+
+
+def test_merge_kpi_cubes_adds_and_removes_recordings(recordings):
+    first, rest = recordings.iloc[:2], recordings.iloc[2:]
+    merged = merge_kpi_cubes(build_kpi_cube(first), build_kpi_cube(rest))
+    pd.testing.assert_frame_equal(summarize_kpi_cube(merged), summarize_kpi_cube(build_kpi_cube(recordings)))
+
+    # Groups left without recordings are dropped
+    removed = merge_kpi_cubes(merged, build_kpi_cube(rest), sign=-1)
+    assert removed["Recordings"].sum() == 2
+    assert set(removed.index.get_level_values("Folder")) == {"a"}
+    pd.testing.assert_frame_equal(summarize_kpi_cube(removed), summarize_kpi_cube(build_kpi_cube(first)))
+
+    assert merge_kpi_cubes(build_kpi_cube(recordings.iloc[:0]), build_kpi_cube(first)).equals(build_kpi_cube(first))
+
+
+def test_score_histograms_count_every_whole_score(recordings):
+    histograms = build_score_histograms(recordings)
+    assert list(histograms.index) == list(range(11))
+    assert list(histograms.columns) == SCORE_COLUMNS
+    assert histograms["BANT Score"][[2, 4, 7, 9]].tolist() == [1, 1, 1, 1]
+    assert histograms["BANT Score"].sum() == 4
+    # Missing scores are not binned
+    assert histograms["SPIN Score"].sum() == 3
+    assert (build_score_histograms(recordings.iloc[:0]).to_numpy() == 0).all()
+
+
+def test_folder_index_takes_the_rows_of_one_folder(recordings):
+    index = FolderIndex(recordings)
+    assert index.folders == ["a", "b"]
+    rows = index.rows("a")
+    assert rows["_id"].map(lambda oid: oid["$oid"]).tolist() == ["1", "2", "3"]
+    pd.testing.assert_frame_equal(rows, recordings[recordings["Folder"] == "a"])
+    assert index.rows("missing").empty
+    assert index.score_means.loc["a", "BANT Score"] == 5
+    assert index.score_means.loc["a", "SPIN Score"] == 3
+
+    empty = FolderIndex(recordings.iloc[:0])
+    assert empty.folders == []
+    assert empty.rows("a").empty
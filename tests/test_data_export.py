@@ -0,0 +1,38 @@
+import os
+
+import pandas as pd
+import pytest
+
+from data_export import write_export
+from data_loader import load_recordings, unique_recordings
+
+
+@pytest.fixture
+def rows(data_tree):
+    df, _ = load_recordings(data_tree)
+    rows = unique_recordings(df).reset_index(drop=True)
+    # Empty in the first chunk only: the Parquet schema must still take text later on
+    return rows.assign(Notes=[None] * (len(rows) - 1) + ["call back on Monday"])
+
+
+@pytest.mark.parametrize("fmt, read", [("CSV", pd.read_csv), ("Parquet", pd.read_parquet)])
+def test_write_export_writes_every_chunk(rows, fmt, read):
+    path = write_export(rows, fmt, chunk_rows=2)
+    try:
+        exported = read(path)
+    finally:
+        os.remove(path)
+    assert path.endswith(".csv" if fmt == "CSV" else ".parquet")
+    assert len(exported) == len(rows) == 4
+    assert exported["_id"].tolist() == rows["_id"].map(lambda oid: oid["$oid"]).tolist()
+    assert exported["Filename"].tolist() == rows["Filename"].tolist()
+    assert exported["BANT Score"].tolist() == rows["BANT Score"].tolist()
+    assert exported["Notes"].tolist()[-1] == "call back on Monday"
+
+
+def test_write_export_of_no_rows(rows):
+    path = write_export(rows.iloc[:0], "CSV")
+    try:
+        assert pd.read_csv(path).columns.tolist() == rows.columns.tolist()
+    finally:
+        os.remove(path)
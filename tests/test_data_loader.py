@@ -0,0 +1,243 @@
+import datetime
+import json
+import os
+
+import pandas as pd
+
+from conftest import recording, touch, write_recording
+from data_loader import (
+    SCORE_COLUMNS,
+    apply_schema,
+    dedup_keys,
+    fetch_data_from_jsonl,
+    load_recordings,
+    manifest_files,
+    mark_duplicate_recordings,
+    merge_changed_recordings,
+    parse_call_dates,
+    read_recordings_frame,
+    read_snapshot,
+    recording_keys,
+    recording_window,
+    scan_recording_files,
+    write_snapshot,
+)
+
+
+def test_merge_changed_recordings_parses_only_changed_files(data_tree):
+    entries = scan_recording_files(data_tree)
+    df, parsed = merge_changed_recordings(entries, {}, None)
+    assert parsed == len(df) == 6
+
+    path = write_recording(data_tree, "a-folder", 1723036302201, recording("own-a-folder", score=9))
+    touch(path)
+    os.remove(os.path.join(data_tree, "c-folder", "recording_1723036302191.json"))
+    merged, parsed = merge_changed_recordings(scan_recording_files(data_tree), manifest_files(entries), df)
+
+    assert parsed == 1
+    assert len(merged) == 5
+    assert "c-folder/recording_1723036302191.json" not in set(recording_keys(merged))
+    changed = merged[recording_keys(merged) == "a-folder/recording_1723036302201.json"]
+    assert changed["BANT Score"].tolist() == [9]
+
+
+def test_snapshot_round_trip(data_tree, tmp_path):
+    snapshot_path = str(tmp_path / "snapshot")
+    assert write_snapshot(data_tree, snapshot_path) == 6
+    files, df = read_snapshot(data_tree, snapshot_path)
+
+    assert files == manifest_files(scan_recording_files(data_tree))
+    assert sorted(recording_keys(df)) == sorted(files)
+    assert df["_id"].map(lambda oid: oid["$oid"]).value_counts()["shared"] == 3
+    assert df["BANT Score"].sum() == 3 * 5 + 1 + 2 + 3
+
+    # A snapshot of another data folder is ignored
+    assert read_snapshot(str(tmp_path / "other"), snapshot_path) == ({}, None)
+
+
+# Decoded files with the schema applied, in file order, for comparing decoders
+def decoded_frame(entries, decoder):
+    df = apply_schema(read_recordings_frame(entries, mode="serial", decoder=decoder))
+    return df.sort_values(["Folder", "Filename"], ignore_index=True)
+
+
+def test_pyarrow_decoder_matches_the_record_decoders(data_tree):
+    entries = scan_recording_files(data_tree)
+    arrow, stdlib = decoded_frame(entries, "pyarrow"), decoded_frame(entries, "stdlib")
+    columns = ["Folder", "Filename", "Date", "Course Interested", *SCORE_COLUMNS]
+    pd.testing.assert_frame_equal(arrow[columns], stdlib[columns])
+    assert arrow["_id"].map(lambda oid: oid["$oid"]).tolist() == stdlib["_id"].map(lambda oid: oid["$oid"]).tolist()
+
+
+def test_pyarrow_decoder_falls_back_on_files_it_cannot_read_as_a_batch(data_tree):
+    # A score stored as a number in one file and as text in the others
+    write_recording(data_tree, "a-folder", 1723036302300, {**recording("number"), "BANT Score": 7})
+    broken = os.path.join(data_tree, "b-folder", "recording_1723036302301.json")
+    with open(broken, "w") as file:
+        file.write('{"_id": {"$oid": "broken"}, "BANT Score": ')
+
+    df = decoded_frame(scan_recording_files(data_tree), "pyarrow")
+    assert len(df) == 7
+    assert "recording_1723036302301.json" not in set(df["Filename"])
+    assert df.loc[df["Filename"] == "recording_1723036302300.json", "BANT Score"].tolist() == [7]
+
+
+def write_jsonl(path, records):
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n")
+    return str(path)
+
+
+def test_fetch_data_from_jsonl_counts_duplicates_apart_from_the_date_range(tmp_path):
+    path = write_jsonl(
+        tmp_path / "export.jsonl",
+        [
+            {**recording("in-range", date="23-08-2024"), "Folder": "a"},
+            {**recording("in-range", date="23-08-2024"), "Folder": "b"},
+            {**recording("out-of-range", date="01-01-2024"), "Folder": "a"},
+            {**recording("out-of-range", date="01-01-2024"), "Folder": "b"},
+            {**recording("out-of-range", date="01-01-2024"), "Folder": "c"},
+            {**recording("other", date="01-02-2024")},
+        ],
+    )
+    date_range = (datetime.date(2024, 8, 1), datetime.date(2024, 8, 31))
+
+    # Chunks of two lines, so copies of a recording land in different chunks
+    df, parsed, duplicates = fetch_data_from_jsonl(path, chunk_rows=2, policy="id")
+    assert (len(df), parsed, duplicates) == (6, 6, 3)
+    assert df.loc[df["Folder"] == "unassigned", "Duplicate"].tolist() == [False]
+
+    df, parsed, duplicates = fetch_data_from_jsonl(path, chunk_rows=2, policy="id", date_range=date_range)
+    assert (len(df), parsed, duplicates) == (2, 6, 1)
+    assert df.loc[~df["Duplicate"], "Folder"].tolist() == ["a"]
+
+
+def test_fetch_data_from_jsonl_fills_in_missing_filenames_and_dates(tmp_path):
+    undated = {key: value for key, value in recording("undated").items() if key != "Date"}
+    path = write_jsonl(
+        tmp_path / "export.jsonl",
+        [
+            # No record of the first chunk has a Filename or a Date
+            {**undated, "Folder": "a"},
+            {key: value for key, value in undated.items() if key != "_id"},
+            {**recording("dated"), "Folder": "a", "Filename": "recording 1723036302191.txt"},
+            {**undated, "Folder": "b", "Filename": "recording 1723036302191.txt"},
+        ],
+    )
+    df, parsed, _ = fetch_data_from_jsonl(path, chunk_rows=2, policy="id")
+    assert parsed == 4
+    assert df["Filename"].tolist() == ["undated", "record 2", "recording 1723036302191.txt", "recording 1723036302191.txt"]
+    assert recording_keys(df).is_unique
+    # Without a Date, the date comes from the recording timestamp where the name has one
+    assert df["Date"].isna().tolist() == [True, True, False, False]
+    assert df["Date from filename"].tolist() == [False, False, False, True]
+
+    date_range = (datetime.date(2024, 8, 1), datetime.date(2024, 8, 31))
+    df, _, _ = fetch_data_from_jsonl(path, chunk_rows=2, policy="id", date_range=date_range)
+    assert df["Folder"].astype(str).tolist() == ["a", "b"]
+
+
+def test_dedup_keys_policies():
+    df = pd.DataFrame(
+        {
+            "_id": [{"$oid": "x"}, {"$oid": "x"}, None],
+            "Filename": ["recording_1.json", "recording_2.json", "recording_3.json"],
+        }
+    )
+    assert dedup_keys(df, "id").tolist() == ["x", "x", None]
+    assert dedup_keys(df, "id+timestamp").tolist() == ["x@1", "x@2", None]
+    assert dedup_keys(df, "off").isna().all()
+
+
+def test_mark_duplicate_recordings_keeps_the_lowest_folder_whatever_the_row_order():
+    df = pd.DataFrame(
+        {
+            "_id": [{"$oid": "x"}, {"$oid": "y"}, {"$oid": "x"}, None, {"$oid": "x"}],
+            "Folder": ["c", "c", "a", "a", "b"],
+            "Filename": ["recording_1.json"] * 5,
+        }
+    )
+    for order in ([0, 1, 2, 3, 4], [4, 3, 2, 1, 0]):
+        marked, duplicates = mark_duplicate_recordings(df.iloc[order].reset_index(drop=True), "id")
+        flags = {
+            (folder, oid["$oid"] if oid else None): duplicate
+            for folder, oid, duplicate in zip(marked["Folder"], marked["_id"], marked["Duplicate"])
+        }
+        assert duplicates == 2
+        assert flags == {("a", "x"): False, ("b", "x"): True, ("c", "x"): True, ("c", "y"): False, ("a", None): False}
+
+
+def test_load_recordings_keeps_every_folder_and_a_stable_counted_copy(data_tree):
+    df, load_stats = load_recordings(data_tree)
+    assert sorted(df["Folder"].astype(str).unique()) == ["a-folder", "b-folder", "c-folder"]
+    assert load_stats["files"] == 6
+    assert load_stats["duplicates"] == 2
+    shared = df[dedup_keys(df) == "shared"]
+    assert shared.loc[~shared["Duplicate"], "Folder"].tolist() == ["a-folder"]
+
+    # Re-parsed rows are appended after the cached ones; the counted copy must not move
+    touch(os.path.join(data_tree, "a-folder", "recording_1723036302191.json"))
+    df, load_stats = load_recordings(data_tree)
+    assert load_stats["parsed"] == 1
+    shared = df[dedup_keys(df) == "shared"]
+    assert shared.loc[~shared["Duplicate"], "Folder"].tolist() == ["a-folder"]
+
+
+AUGUST_2024 = (datetime.date(2024, 8, 1), datetime.date(2024, 8, 31))
+
+
+def test_recording_window_spans_the_range_plus_the_slack():
+    day = datetime.date(2024, 8, 23)
+    low, high = recording_window((day, day), slack_days=0)
+    assert (low, high) == (1724371200000, 1724371200000 + 86400000)
+    assert recording_window((day, day), slack_days=2) == (low - 2 * 86400000, high + 2 * 86400000)
+
+
+def test_range_loads_parse_only_new_or_changed_files_in_the_window(data_tree):
+    load_recordings(data_tree)
+    # Recorded in 2023: outside the window, so never opened by an August load
+    write_recording(data_tree, "a-folder", 1672531200000, recording("old", date="01-01-2023"))
+    write_recording(data_tree, "a-folder", 1723036309999, recording("new"))
+
+    df, load_stats = load_recordings(data_tree, date_range=AUGUST_2024)
+    assert (len(df), load_stats["parsed"]) == (7, 1)
+
+    touch(os.path.join(data_tree, "b-folder", "recording_1723036302191.json"))
+    df, load_stats = load_recordings(data_tree, date_range=AUGUST_2024)
+    assert (len(df), load_stats["parsed"]) == (7, 2)
+    assert sorted(recording_keys(df)) == sorted(recording_keys(load_recordings(data_tree, use_cache=False, date_range=AUGUST_2024)[0]))
+
+
+def test_read_snapshot_reads_only_the_month_partitions_of_the_range(data_tree, tmp_path):
+    write_recording(data_tree, "a-folder", 1726358400000, recording("september", date="15-09-2024"))
+    snapshot_path = str(tmp_path / "snapshot")
+    write_snapshot(data_tree, snapshot_path)
+    # A range load that opened the September partition would fail on it
+    partition = os.path.join(snapshot_path, "Month=2024-09")
+    for name in os.listdir(partition):
+        with open(os.path.join(partition, name), "wb") as file:
+            file.write(b"not parquet")
+
+    files, df = read_snapshot(data_tree, snapshot_path, AUGUST_2024)
+    assert len(files) == 7
+    assert len(df) == 6
+    assert (df["Date"].dt.strftime("%Y-%m") == "2024-08").all()
+
+
+def test_parse_call_dates_falls_back_to_the_recording_timestamp():
+    df = pd.DataFrame(
+        {
+            "Date": ["23-08-2024", None, "2024/08/23", "N/A", None],
+            "Filename": [
+                "recording_1723036302191.json",
+                "recording_1723036302191.json",
+                "recording 1723036302191.txt",
+                "recording_1723036302191.json",
+                "notes.json",
+            ],
+        }
+    )
+    dates, from_filename = parse_call_dates(df)
+    recorded = pd.Timestamp("2024-08-07")
+    assert dates.tolist()[:4] == [pd.Timestamp("2024-08-23"), recorded, recorded, recorded]
+    assert pd.isna(dates.iloc[4])
+    assert from_filename.tolist() == [False, True, True, True, False]
@@ -0,0 +1,15 @@
+import pandas as pd
+
+from figures import sentiment_over_time_figure
+
+
+def test_sentiment_over_time_runs_in_date_order():
+    folder_data = pd.DataFrame(
+        {
+            "Date": pd.to_datetime(["2024-08-23", "2024-08-01", "2024-08-12"]),
+            "Sentiment Analysis Score": [3, 8, 5],
+        }
+    )
+    line = sentiment_over_time_figure(folder_data).data[0]
+    assert list(line.x) == sorted(folder_data["Date"])
+    assert list(line.y) == [8, 5, 3]
@@ -0,0 +1,120 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+import live_ingest
+from aggregates import build_kpi_cube, summarize_kpi_cube
+from conftest import recording, write_recording
+from data_loader import unique_recordings
+from live_ingest import LiveCorpus
+
+SHARED = "recording_1723036302191.json"
+
+
+# Changes are applied by calling _apply directly; the worker's own batches never run
+@pytest.fixture
+def corpus(data_tree):
+    corpus = LiveCorpus(data_tree, interval=3600)
+    yield corpus
+    corpus.stop()
+
+
+def counted_folder(corpus, filename=SHARED):
+    df, _, _ = corpus.current()
+    rows = df[(df["Filename"] == filename) & ~df["Duplicate"]]
+    return rows["Folder"].astype(str).tolist()
+
+
+# The incrementally maintained cube summarizes the same recordings as a cube built from scratch
+def assert_cube_matches_frame(corpus):
+    df, _, cube = corpus.current()
+    pd.testing.assert_frame_equal(
+        summarize_kpi_cube(cube),
+        summarize_kpi_cube(build_kpi_cube(unique_recordings(df))),
+    )
+
+
+def test_rewriting_a_duplicate_copy_keeps_the_counts(corpus, data_tree):
+    path = os.path.join(data_tree, "c-folder", SHARED)
+    for _ in range(2):
+        corpus._apply({path: 0}, set())
+        _, load_stats, _ = corpus.current()
+        assert (load_stats["files"], load_stats["duplicates"]) == (6, 2)
+    assert counted_folder(corpus) == ["a-folder"]
+    assert corpus.current()[2]["Recordings"].sum() == 4
+    assert_cube_matches_frame(corpus)
+
+
+def test_deleting_copies_lowers_the_counts_and_moves_the_counted_copy(corpus, data_tree):
+    kept = os.path.join(data_tree, "a-folder", SHARED)
+    os.remove(kept)
+    corpus._apply({}, {kept})
+    _, load_stats, _ = corpus.current()
+    assert (load_stats["files"], load_stats["duplicates"]) == (5, 1)
+    assert counted_folder(corpus) == ["b-folder"]
+    assert_cube_matches_frame(corpus)
+
+    # The lowest folder takes its copy back once it reappears
+    write_recording(data_tree, "a-folder", 1723036302191, recording("shared", score=9))
+    corpus._apply({kept: 0}, set())
+    _, load_stats, _ = corpus.current()
+    assert (load_stats["files"], load_stats["duplicates"]) == (6, 2)
+    assert counted_folder(corpus) == ["a-folder"]
+    assert_cube_matches_frame(corpus)
+
+
+def test_new_recordings_are_counted_once(corpus, data_tree):
+    paths = [
+        write_recording(data_tree, "b-folder", 1723036309999, recording("new")),
+        write_recording(data_tree, "a-folder", 1723036309999, recording("new")),
+    ]
+    corpus._apply({path: 0 for path in paths}, set())
+    df, load_stats, cube = corpus.current()
+    assert (load_stats["files"], load_stats["duplicates"]) == (8, 3)
+    assert counted_folder(corpus, "recording_1723036309999.json") == ["a-folder"]
+    assert len(unique_recordings(df)) == cube["Recordings"].sum() == 5
+    assert_cube_matches_frame(corpus)
+
+
+# Wait for the watcher to queue an event, then apply the queue the way the worker does
+def apply_queued(corpus, queued, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not queued() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert queued()
+    with corpus._lock:
+        pending, corpus._pending = corpus._pending, {}
+        deleted, corpus._deleted = corpus._deleted, set()
+        deleted_folders, corpus._deleted_folders = corpus._deleted_folders, set()
+    corpus._apply(pending, deleted, deleted_folders)
+
+
+def test_a_folder_moved_out_of_the_tree_drops_its_rows(corpus, data_tree, tmp_path):
+    os.rename(os.path.join(data_tree, "a-folder"), str(tmp_path / "a-folder"))
+    apply_queued(corpus, lambda: corpus._deleted_folders)
+    df, load_stats, _ = corpus.current()
+    assert sorted(df["Folder"].astype(str).unique()) == ["b-folder", "c-folder"]
+    assert (load_stats["files"], load_stats["duplicates"]) == (4, 1)
+    assert counted_folder(corpus) == ["b-folder"]
+    assert_cube_matches_frame(corpus)
+
+
+def test_files_written_during_the_initial_load_are_picked_up(data_tree, monkeypatch):
+    load_recordings = live_ingest.load_recordings
+
+    def slow_load(main_folder_path):
+        loaded = load_recordings(main_folder_path)
+        write_recording(data_tree, "b-folder", 1723036309999, recording("late"))
+        return loaded
+
+    monkeypatch.setattr(live_ingest, "load_recordings", slow_load)
+    corpus = LiveCorpus(data_tree, interval=3600)
+    try:
+        apply_queued(corpus, lambda: corpus._pending)
+        df, load_stats, _ = corpus.current()
+        assert load_stats["files"] == 7
+        assert "recording_1723036309999.json" in set(df["Filename"])
+    finally:
+        corpus.stop()
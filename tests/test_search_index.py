@@ -0,0 +1,54 @@
+import pandas as pd
+
+from search_index import SearchIndex, escape_markdown, snippet
+
+
+def recordings(*rows):
+    return pd.DataFrame(
+        [{"Folder": folder, "Filename": filename, "Summary": summary} for folder, filename, summary in rows]
+    )
+
+
+def test_search_index_add_remove_search():
+    index = SearchIndex()
+    index.build(
+        recordings(
+            ("a", "recording_1.json", "Asked about the course fee"),
+            ("a", "recording_2.json", "Fee too high, asked for a discount"),
+            ("b", "recording_3.json", "Interested in placements"),
+        )
+    )
+    assert index.ready
+    # Every word must match, stop words are ignored, latest added first
+    assert index.search("fee") == ["a/recording_2.json", "a/recording_1.json"]
+    assert index.search("the FEE discount") == ["a/recording_2.json"]
+    assert index.search("fee placements") == []
+    assert index.search("the") == []
+
+    # A changed recording replaces its old text
+    index.add(recordings(("a", "recording_1.json", "Asked about placements")))
+    assert index.search("fee") == ["a/recording_2.json"]
+    assert index.search("placements") == ["a/recording_1.json", "b/recording_3.json"]
+
+    index.remove({"b/recording_3.json", "b/missing.json"})
+    assert index.search("placements") == ["a/recording_1.json"]
+
+
+def test_snippet_bolds_the_query_words_and_escapes_the_text():
+    text = "Lead said <b>no</b> to the *fee* of 1_000 #1 $5 :smile:"
+    assert snippet(text, "fee") == (
+        r"Lead said &lt;b&gt;no&lt;/b&gt; to the \*<b>fee</b>\* of 1\_000 \#1 \$5 \:smile\:"
+    )
+    assert snippet(text, "discount") is None
+    assert snippet(None, "fee") is None
+
+    long_text = "x " * 100 + "fee" + " y" * 100
+    excerpt = snippet(long_text, "fee", width=20)
+    assert excerpt.startswith("…") and excerpt.endswith("…")
+    assert "<b>fee</b>" in excerpt
+
+
+def test_escape_markdown():
+    assert escape_markdown("my_folder") == r"my\_folder"
+    assert escape_markdown("<script>&") == "&lt;script&gt;&amp;"
+    assert escape_markdown("1. [a](b)") == r"1\. \[a\]\(b\)"
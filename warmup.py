@@ -0,0 +1,77 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from streamlit import runtime
+
+from aggregates import folder_index, score_histograms, shared_kpi_cube
+from data_loader import data_fingerprint, data_version, load_shared_recordings
+from live_ingest import get_live_corpus, uses_live_ingest
+from search_index import recording_positions, shared_search_index
+
+logger = logging.getLogger(__name__)
+
+# Data versions whose caches were warmed (or are being warmed), most recent last. Only the
+# latest few are remembered; the caches themselves keep four versions.
+WARMED_VERSIONS = 16
+_warmed = OrderedDict()
+_lock = threading.Lock()
+
+
+def _warm(version, df, live, all_time):
+    start = time.perf_counter()
+    try:
+        folder_index(version, df)
+        score_histograms(version, df)
+        # Live ingestion keeps its own cube and search index up to date
+        if not live:
+            shared_kpi_cube(version, df)
+        # The search index is a pure-Python pass over every Summary and Feedback that holds
+        # the GIL, so only the all-time corpus gets one ahead of time. Every date range is its
+        # own data version; its index is built the first time someone searches it.
+        if all_time:
+            recording_positions(version, df)
+            if not live:
+                shared_search_index(version, df)
+    except Exception:
+        logger.exception("Warming the caches of data version %s failed", version)
+        return
+    logger.info("Warmed the caches of data version %s in %.2fs", version, time.perf_counter() - start)
+
+
+# Build the shared caches of a loaded corpus on a background thread, once per data version.
+# A session that asks for one of them while it is being built waits for that build rather
+# than starting its own.
+def warm_caches(df, load_stats, live=False):
+    version = data_version(load_stats)
+    with _lock:
+        if version in _warmed:
+            return
+        _warmed[version] = True
+        while len(_warmed) > WARMED_VERSIONS:
+            _warmed.popitem(last=False)
+    all_time = load_stats.get("date_range") is None
+    threading.Thread(target=_warm, args=(version, df, live, all_time), name="cache-warmup", daemon=True).start()
+
+
+# Load the all-time corpus and warm its caches. serve.py runs this on a background thread as
+# the server starts, before any session connects; sessions opened in the meantime wait for
+# this load instead of each starting one.
+def prefetch(main_folder_path):
+    start = time.perf_counter()
+    live = uses_live_ingest(main_folder_path)
+    try:
+        if live:
+            df, load_stats, _ = get_live_corpus(main_folder_path).current()
+        else:
+            # Same arguments as the dashboard's all-time load, so sessions share this cache entry
+            df, load_stats = load_shared_recordings(main_folder_path, data_fingerprint(main_folder_path), None)
+    except Exception:
+        logger.exception("Prefetching %s failed", main_folder_path)
+        return
+    logger.info("Prefetched %d recordings from %s in %.2fs", len(df), main_folder_path, time.perf_counter() - start)
+    # cache_data caches take their storage from the runtime, so wait for the server to be up
+    while not runtime.exists():
+        time.sleep(0.1)
+    warm_caches(df, load_stats, live=live)